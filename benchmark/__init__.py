@@ -0,0 +1,14 @@
+"""Benchmark suite for yw-timeline.
+
+Run from the repository root: python -m benchmark.run_benchmarks --help
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+
+SRC_PATH = os.path.normpath(f'{os.path.dirname(os.path.abspath(__file__))}/../src')
+if not SRC_PATH in sys.path:
+    sys.path.insert(0, SRC_PATH)
@@ -0,0 +1,65 @@
+"""Benchmark for rebuilding Timeline event subtrees.
+
+Update 1k to 100k existing scene events with SceneEvent.build_subtree(),
+and create the same number of new events.
+
+usage: python -m benchmark.bench_build_subtree [size ...]  (from the repository root)
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+import time
+import xml.etree.ElementTree as ET
+from ywtimelinelib.scene_event import SceneEvent
+
+SIZES = [1000, 10000, 100000]
+EVENT = '''<event>
+<start>2021-07-26 08:00:00</start>
+<end>2021-07-26 09:00:00</end>
+<text>Scene title</text>
+<progress>0</progress>
+<fuzzy>False</fuzzy>
+<locked>False</locked>
+<ends_today>False</ends_today>
+<category>Item</category>
+<description>Scene description</description>
+<labels>ScID:1</labels>
+<default_color>170,240,160</default_color>
+</event>'''
+
+
+def make_scene_event(i):
+    """Return a scene event to be written."""
+    sceneEvent = SceneEvent()
+    sceneEvent.title = f'Scene {i}'
+    sceneEvent.desc = f'Description {i}'
+    sceneEvent._startDateTime = f'2021-07-26 {i % 24:02}:00:00'
+    sceneEvent._endDateTime = f'2021-07-26 {i % 24:02}:30:00'
+    return sceneEvent
+
+
+def run(sizes):
+    print(f'{"events":>8} {"update s":>9} {"us/event":>9} {"create s":>9} {"us/event":>9}')
+    for eventCount in sizes:
+        sceneEvents = [make_scene_event(i) for i in range(eventCount)]
+        xmlEvents = [ET.fromstring(EVENT) for __ in range(eventCount)]
+        start = time.perf_counter()
+        dtMin = dtMax = None
+        for i, sceneEvent in enumerate(sceneEvents):
+            dtMin, dtMax = sceneEvent.build_subtree(xmlEvents[i], str(i), dtMin, dtMax)
+        updateSeconds = time.perf_counter() - start
+
+        xmlEvents = [ET.Element('event') for __ in range(eventCount)]
+        start = time.perf_counter()
+        dtMin = dtMax = None
+        for i, sceneEvent in enumerate(sceneEvents):
+            dtMin, dtMax = sceneEvent.build_subtree(xmlEvents[i], str(i), dtMin, dtMax)
+        createSeconds = time.perf_counter() - start
+        print(f'{eventCount:>8} {updateSeconds:>9.3f} {updateSeconds / eventCount * 1e6:>9.1f} '
+              f'{createSeconds:>9.3f} {createSeconds / eventCount * 1e6:>9.1f}')
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,79 @@
+"""Benchmark for the batch date/time conversion of scene events.
+
+Convert the date/times of 1k to 200k scene events read from a timeline,
+and merge them from yWriter scenes, scene by scene and as a batch.
+The batch conversion is only faster if NumPy is installed.
+
+usage: python -m benchmark.bench_date_time [size ...]  (from the repository root)
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+import random
+import time
+from datetime import datetime
+from datetime import timedelta
+from pywriter.model.scene import Scene
+from ywtimelinelib import scene_event
+from ywtimelinelib.scene_event import SceneEvent
+
+SIZES = [1000, 10000, 200000]
+START = datetime(1900, 1, 1)
+
+
+def make_items(eventCount, rand):
+    """Return the arguments for set_date_times() and merge_date_times()."""
+    dateTimes = []
+    sources = []
+    for __ in range(eventCount):
+        start = START + timedelta(minutes=rand.randrange(36500 * 1440))
+        end = start + timedelta(minutes=rand.randrange(3000))
+        dateTimes.append((SceneEvent(), start.isoformat(' '), end.isoformat(' '), rand.random() < 0.2))
+        source = Scene()
+        if rand.random() < 0.2:
+            source.day = str(rand.randrange(-100, 100))
+        else:
+            source.date = start.date().isoformat()
+        source.time = start.time().isoformat()
+        source.lastsDays = str(rand.randrange(3))
+        source.lastsHours = str(rand.randrange(24))
+        source.lastsMinutes = str(rand.randrange(60))
+        sources.append((SceneEvent(), source))
+    return dateTimes, sources
+
+
+def run(sizes):
+    rand = random.Random(1)
+    if scene_event.np is None:
+        print('NumPy is not installed: The batch methods use the scalar path.')
+    else:
+        scene_event.np.zeros(1)
+        # NumPy is imported on first use; keep this out of the measurements.
+    print(f'{"events":>8} {"set s":>9} {"set batch s":>12} {"merge s":>9} {"merge batch s":>14}')
+    for eventCount in sizes:
+        dateTimes, sources = make_items(eventCount, rand)
+        start = time.perf_counter()
+        for event, startDateTime, endDateTime, isUnspecific in dateTimes:
+            event.set_date_time(startDateTime, endDateTime, isUnspecific)
+        setSeconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        SceneEvent.set_date_times(dateTimes)
+        setBatchSeconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for event, source in sources:
+            event.merge_date_time(source)
+        mergeSeconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        SceneEvent.merge_date_times(sources)
+        mergeBatchSeconds = time.perf_counter() - start
+        print(f'{eventCount:>8} {setSeconds:>9.3f} {setBatchSeconds:>12.3f} '
+              f'{mergeSeconds:>9.3f} {mergeBatchSeconds:>14.3f}')
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,66 @@
+"""Benchmark for the ID generation.
+
+Create 500 to 100k new IDs in a container holding as many existing IDs,
+by probing with create_id() and with an IdAllocator.
+Probing is skipped for the larger sizes, because it takes quadratic time.
+
+usage: python -m benchmark.bench_ids [size ...]  (from the repository root)
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+import time
+from pywriter.model.id_generator import create_id
+from pywriter.model.id_generator import IdAllocator
+
+SIZES = [500, 5000, 100000]
+MAX_LIST_SIZE = 500
+MAX_DICT_SIZE = 5000
+
+
+def run(sizes):
+    print(f'{"IDs":>8} {"list s":>9} {"dict s":>9} {"alloc s":>9}')
+    for idCount in sizes:
+        existingIds = [str(i) for i in range(1, 2 * idCount, 2)]
+        # Every other ID is in use.
+
+        listSeconds = dictSeconds = None
+        probeResults = None
+        if idCount <= MAX_LIST_SIZE:
+            elements = list(existingIds)
+            start = time.perf_counter()
+            for __ in range(idCount):
+                elements.append(create_id(elements))
+            listSeconds = time.perf_counter() - start
+            probeResults = elements[len(existingIds):]
+
+        if idCount <= MAX_DICT_SIZE:
+            elements = dict.fromkeys(existingIds)
+            start = time.perf_counter()
+            for __ in range(idCount):
+                elements[create_id(elements)] = None
+            dictSeconds = time.perf_counter() - start
+            probeResults = list(elements)[len(existingIds):]
+
+        start = time.perf_counter()
+        idAllocator = IdAllocator(existingIds)
+        allocatorResults = [idAllocator.create_id() for __ in range(idCount)]
+        allocatorSeconds = time.perf_counter() - start
+
+        if probeResults is not None and allocatorResults != probeResults:
+            raise AssertionError('The allocated IDs differ from the probed IDs.')
+
+        print(f'{idCount:>8} {format_seconds(listSeconds)} {format_seconds(dictSeconds)} {allocatorSeconds:>9.3f}')
+
+
+def format_seconds(seconds):
+    if seconds is None:
+        return f'{"-":>9}'
+
+    return f'{seconds:>9.3f}'
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or SIZES)
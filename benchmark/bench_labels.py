@@ -0,0 +1,64 @@
+"""Benchmark for the scene label parsing.
+
+Find the scene markers in the labels of 1k to 200k events sharing a few
+label sets, by searching the patterns per event and with the LabelParser.
+
+usage: python -m benchmark.bench_labels [size ...]  (from the repository root)
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+import sys
+import random
+import time
+from ywtimelinelib.label_parser import LabelParser
+
+SIZES = [1000, 10000, 200000]
+SCENE_MARKER = 'Scene'
+LABEL_SETS = [
+    'Scene',
+    'Plot A;Scene',
+    'Characters: Alice, Bob; Location: Harbour; Scene',
+    'Plot B;Subplot C;Draft',
+    'Research',
+    ]
+
+
+def search(labels):
+    """Return the scene marker like TlFile did before using the LabelParser."""
+    sceneMatch = re.search(r'ScID\:([0-9]+)', labels)
+    if sceneMatch is None:
+        sceneMatch = re.search(SCENE_MARKER, labels)
+    if sceneMatch is None:
+        return None
+
+    return sceneMatch.group()
+
+
+def run(sizes):
+    rand = random.Random(1)
+    print(f'{"events":>8} {"search s":>9} {"parser s":>9}')
+    for eventCount in sizes:
+        labels = [rand.choice(LABEL_SETS) for __ in range(eventCount)]
+        # Timeline creates a new string per event.
+        labels = [''.join(list(text)) for text in labels]
+
+        start = time.perf_counter()
+        searchResults = [search(text) for text in labels]
+        searchSeconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        labelParser = LabelParser(SCENE_MARKER)
+        parserResults = [labelParser.get_scene_marker(text) for text in labels]
+        parserSeconds = time.perf_counter() - start
+
+        if parserResults != searchResults:
+            raise AssertionError('The label parser results differ from the search results.')
+
+        print(f'{eventCount:>8} {searchSeconds:>9.3f} {parserSeconds:>9.3f}')
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or SIZES)
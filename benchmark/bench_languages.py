@@ -0,0 +1,74 @@
+"""Benchmark for the language scan of the scene contents.
+
+Determine the languages of 100 to 1k multilingual scenes with 1000 tags each,
+by searching the text remainders and with the cached per-scene scan,
+then again after editing one scene.
+
+usage: python -m benchmark.bench_languages [size ...]  (from the repository root)
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+import random
+import time
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from pywriter.model.scene import LANGUAGE_TAG
+
+SIZES = [100, 500, 1000]
+TAGS_PER_SCENE = 1000
+LANGUAGES = ['en-AU', 'en-GB', 'fr-FR', 'de-CH', 'es-ES', 'it-IT']
+
+
+def get_languages(novel):
+    """Return the language codes like Novel.get_languages() did before caching."""
+    languages = []
+    for scId in novel.scenes:
+        text = novel.scenes[scId].sceneContent
+        if text:
+            m = LANGUAGE_TAG.search(text)
+            while m:
+                text = text[m.span()[1]:]
+                if not m.group(1) in languages:
+                    languages.append(m.group(1))
+                m = LANGUAGE_TAG.search(text)
+    return languages
+
+
+def run(sizes):
+    rand = random.Random(1)
+    print(f'{"scenes":>8} {"search s":>9} {"scan s":>9} {"rescan s":>9}')
+    for sceneCount in sizes:
+        novel = Novel()
+        for i in range(sceneCount):
+            chunks = []
+            for __ in range(TAGS_PER_SCENE):
+                language = rand.choice(LANGUAGES)
+                chunks.append(f'Some standard text. [lang={language}]Some foreign text.[/lang={language}] ')
+            novel.scenes[str(i)] = Scene()
+            novel.scenes[str(i)].sceneContent = ''.join(chunks)
+
+        start = time.perf_counter()
+        searchResults = get_languages(novel)
+        searchSeconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        novel.get_languages()
+        scanSeconds = time.perf_counter() - start
+        if novel.languages != searchResults:
+            raise AssertionError('The scan results differ from the search results.')
+
+        novel.scenes['0'].sceneContent = f'{novel.scenes["0"].sceneContent}[lang=pt-BR]Olá.[/lang=pt-BR]'
+        start = time.perf_counter()
+        novel.get_languages()
+        rescanSeconds = time.perf_counter() - start
+        if novel.languages != get_languages(novel):
+            raise AssertionError('The rescan results differ from the search results.')
+
+        print(f'{sceneCount:>8} {searchSeconds:>9.3f} {scanSeconds:>9.3f} {rescanSeconds:>9.4f}')
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,78 @@
+"""Benchmark for the interval index over scene events.
+
+Query scenes overlapping one-day periods among 1k to 100k scene events
+lasting from minutes to weeks, using the SceneIndex and a linear scan.
+The query time of the index must grow much slower than the scan's.
+
+usage: python -m benchmark.bench_scene_index [size ...]  (from the repository root)
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+import random
+import time
+from datetime import datetime
+from datetime import timedelta
+from ywtimelinelib.dt_helper import get_dt_key
+from ywtimelinelib.scene_index import SceneIndex
+
+SIZES = [1000, 10000, 100000]
+QUERIES = 1000
+START = datetime(1900, 1, 1)
+DAYS = 36500
+
+
+def make_periods(eventCount, rand):
+    """Return a list of (scene ID, start, end) tuples spread over a century."""
+    periods = []
+    for i in range(eventCount):
+        start = START + timedelta(minutes=rand.randrange(DAYS * 1440))
+        end = start + timedelta(minutes=int(rand.expovariate(1 / 600)))
+        periods.append((str(i + 1), start.isoformat(' '), end.isoformat(' ')))
+    return periods
+
+
+def scan(periods, startDateTime, endDateTime):
+    """Return the IDs of the scenes overlapping a period by checking all scenes."""
+    start = get_dt_key(startDateTime)
+    end = get_dt_key(endDateTime)
+    return [scId for scId, scStart, scEnd in periods if scStart <= end and start <= scEnd]
+
+
+def run(sizes):
+    rand = random.Random(1)
+    print(f'{"events":>8} {"build s":>9} {"index us/query":>15} {"scan us/query":>14} {"results/query":>14}')
+    for eventCount in sizes:
+        periods = make_periods(eventCount, rand)
+        queries = []
+        for __ in range(QUERIES):
+            start = START + timedelta(days=rand.randrange(DAYS))
+            queries.append((start.isoformat(' '), (start + timedelta(days=1)).isoformat(' ')))
+
+        start = time.perf_counter()
+        sceneIndex = SceneIndex(periods)
+        buildSeconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexResults = [sceneIndex.get_overlapping(*query) for query in queries]
+        indexSeconds = time.perf_counter() - start
+
+        # The scan gets the sort keys for free and its results are sorted afterwards.
+        keyPeriods = sorted(((scId, get_dt_key(scStart), get_dt_key(scEnd)) for scId, scStart, scEnd in periods),
+                            key=lambda period: period[1])
+        start = time.perf_counter()
+        scanResults = [scan(keyPeriods, *query) for query in queries]
+        scanSeconds = time.perf_counter() - start
+
+        if indexResults != scanResults:
+            raise AssertionError('The index query results differ from the scan results.')
+
+        resultCount = sum(len(result) for result in indexResults) / QUERIES
+        print(f'{eventCount:>8} {buildSeconds:>9.3f} {indexSeconds / QUERIES * 1e6:>15.1f} '
+              f'{scanSeconds / QUERIES * 1e6:>14.1f} {resultCount:>14.1f}')
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or SIZES)
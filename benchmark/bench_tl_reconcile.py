@@ -0,0 +1,72 @@
+"""Benchmark for the event reconciliation in TlFile.write().
+
+Update timelines of 1k to 200k scene events from a yWriter project
+where 10 % of the scenes are removed and 10 % are added.
+The time per event must stay roughly constant (linear scaling),
+so the ratio printed at the end must stay close to 1.
+With quadratic scaling, it would grow like the ratio of the sizes.
+
+usage: python -m benchmark.bench_tl_reconcile [size ...]  (from the repository root)
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+import tempfile
+import time
+from benchmark.generator import ProjectGenerator
+from benchmark.run_benchmarks import KWARGS
+from pywriter.model.scene import Scene
+from ywtimelinelib.tl_file import TlFile
+
+SIZES = [1000, 10000, 50000, 200000]
+
+
+def make_novel(generator):
+    """Return the generator's novel with 10 % of the scenes removed and 10 % new scenes."""
+    novel = generator.novel
+    chapter = novel.chapters[novel.srtChapters[0]]
+    eventCount = generator.sceneCount
+    removed = eventCount // 10
+    for scId in chapter.srtScenes[:removed]:
+        del novel.scenes[scId]
+    del chapter.srtScenes[:removed]
+    for i in range(eventCount + 1, eventCount + removed + 1):
+        scId = str(i)
+        novel.scenes[scId] = Scene()
+        novel.scenes[scId].title = f'Scene {i}'
+        novel.scenes[scId].date = '2021-07-26'
+        novel.scenes[scId].time = f'{i % 24:02}:00:00'
+        novel.scenes[scId].lastsMinutes = '45'
+        novel.scenes[scId].scType = 0
+        chapter.srtScenes.append(scId)
+    return novel
+
+
+def run(sizes):
+    print(f'{"events":>8} {"seconds":>9} {"us/event":>9}')
+    perEvent = {}
+    # key: number of events, value: seconds per event.
+    with tempfile.TemporaryDirectory() as tmpDir:
+        filePath = f'{tmpDir}/benchmark.timeline'
+        for eventCount in sizes:
+            generator = ProjectGenerator(chapters=1, scenesPerChapter=eventCount, characters=0, wordsPerScene=0,
+                                         bcShare=0, twoDigitShare=0)
+            generator.write_timeline(filePath)
+            tlFile = TlFile(filePath, **KWARGS)
+            tlFile.novel = make_novel(generator)
+            start = time.perf_counter()
+            tlFile.write()
+            seconds = time.perf_counter() - start
+            perEvent[eventCount] = seconds / eventCount
+            print(f'{eventCount:>8} {seconds:>9.3f} {perEvent[eventCount] * 1e6:>9.1f}')
+    smallest = min(perEvent)
+    largest = max(perEvent)
+    if largest > smallest:
+        print(f'Time per event at {largest} vs. {smallest} events: '
+              f'{perEvent[largest] / perEvent[smallest]:.2f} (size ratio {largest / smallest:.0f})')
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,50 @@
+"""Benchmark for the element readers of Yw7File.
+
+Read a yWriter project of 50k scenes (500 chapters, 100 characters by default),
+timing the XML parsing and the element readers separately.
+Each scene refers to three characters.
+
+usage: python -m benchmark.bench_yw7_read [scenes [characters]]  (from the repository root)
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from benchmark.generator import ProjectGenerator
+from pywriter.model.novel import Novel
+from pywriter.yw.yw7_file import Yw7File
+
+SCENES = 50000
+SCENES_PER_CHAPTER = 100
+CHARACTERS = 100
+READERS = ('_read_project', '_read_locations', '_read_items', '_read_characters', '_read_scenes', '_read_chapters')
+
+
+def run(sceneCount, characterCount=CHARACTERS):
+    generator = ProjectGenerator(chapters=max(1, sceneCount // SCENES_PER_CHAPTER),
+                                 scenesPerChapter=min(sceneCount, SCENES_PER_CHAPTER),
+                                 characters=characterCount, wordsPerScene=50)
+    with tempfile.TemporaryDirectory() as tmpDir:
+        filePath = f'{tmpDir}/benchmark.yw7'
+        generator.write_yw7(filePath)
+        start = time.perf_counter()
+        root = ET.parse(filePath).getroot()
+        print(f'{"parse XML":<18} {time.perf_counter() - start:>9.3f} s')
+        ywFile = Yw7File(filePath)
+        ywFile.novel = Novel()
+        total = 0
+        for reader in READERS:
+            start = time.perf_counter()
+            getattr(ywFile, reader)(root)
+            seconds = time.perf_counter() - start
+            total += seconds
+            print(f'{reader:<18} {seconds:>9.3f} s')
+        print(f'{"readers total":<18} {total:>9.3f} s  ({total / generator.sceneCount * 1e6:.1f} us/scene)')
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:]] or [SCENES])
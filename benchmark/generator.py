@@ -0,0 +1,218 @@
+"""Provide a deterministic generator for synthetic yWriter projects and timelines.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import random
+from datetime import datetime
+from datetime import timedelta
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from pywriter.model.character import Character
+from pywriter.yw.yw7_file import Yw7File
+
+WORDS = (
+    'the', 'a', 'and', 'of', 'to', 'in', 'was', 'he', 'she', 'it', 'that', 'with',
+    'night', 'river', 'letter', 'garden', 'silence', 'window', 'morning', 'stranger',
+    'walked', 'whispered', 'remembered', 'opened', 'waited', 'laughed', 'turned',
+    'quietly', 'suddenly', 'never', 'always', 'almost', 'again', 'behind', 'beyond',
+    )
+SCENE_COLOR = '170,240,160'
+EVENT_COLOR = '192,192,192'
+
+
+class ProjectGenerator:
+    """Generator for synthetic yWriter projects and matching timelines.
+
+    Public methods:
+        write_yw7(filePath) -- write the yWriter project.
+        write_timeline(filePath, outline) -- write the timeline.
+
+    Public instance variables:
+        novel -- Novel instance with the generated chapters, scenes, and characters.
+        sceneCount: int -- total number of scenes.
+
+    The same arguments always produce the same project.
+    Scenes with "BC" or two-digit years get yWriter's null date,
+    as the timeline import does; their real dates only appear in the timeline.
+    """
+
+    def __init__(self, chapters=10, scenesPerChapter=10, characters=10, wordsPerScene=500,
+                 bcShare=0.05, twoDigitShare=0.05, nonSceneEvents=0, seed=1):
+        """Generate the project.
+
+        Optional arguments:
+            chapters: int -- number of chapters.
+            scenesPerChapter: int -- number of scenes per chapter.
+            characters: int -- number of characters.
+            wordsPerScene: int -- scene text volume.
+            bcShare: float -- share of scenes dated "BC".
+            twoDigitShare: float -- share of scenes dated in years 1 to 99.
+            nonSceneEvents: int -- number of timeline events not assigned to scenes.
+            seed: int -- random seed.
+        """
+        self._random = random.Random(seed)
+        self._nonSceneEvents = nonSceneEvents
+        self._eventDates = {}
+        # key: scene ID, value: tuple of Timeline start and end date/time.
+        self.novel = Novel()
+        self.novel.title = 'Benchmark project'
+        self.novel.authorName = 'yw-timeline'
+        for i in range(1, characters + 1):
+            crId = str(i)
+            self.novel.characters[crId] = Character()
+            self.novel.characters[crId].title = f'Character {i}'
+            self.novel.characters[crId].fullName = f'Character {i} {self._get_words(1).title()}'
+            self.novel.characters[crId].isMajor = i <= 3
+            self.novel.srtCharacters.append(crId)
+        crIds = list(self.novel.characters)
+        self.sceneCount = 0
+        startDate = datetime(2021, 1, 1)
+        for i in range(1, chapters + 1):
+            chId = str(i)
+            self.novel.chapters[chId] = Chapter()
+            self.novel.chapters[chId].title = f'Chapter {i}'
+            self.novel.chapters[chId].chLevel = 0
+            self.novel.chapters[chId].chType = 0
+            self.novel.srtChapters.append(chId)
+            for __ in range(scenesPerChapter):
+                self.sceneCount += 1
+                scId = str(self.sceneCount)
+                scene = Scene()
+                scene.title = f'Scene {scId} {self._get_words(2)}'
+                scene.desc = self._get_words(20)
+                scene.sceneContent = self._get_text(wordsPerScene)
+                scene.scType = 0
+                scene.status = 1
+                if crIds:
+                    scene.characters = self._random.sample(crIds, min(3, len(crIds)))
+                duration = timedelta(minutes=self._random.randrange(15, 24 * 60, 15))
+                start = startDate + timedelta(hours=self._random.randrange(0, 5 * 365 * 24))
+                dice = self._random.random()
+                if dice < bcShare:
+                    year = -self._random.randrange(1, 2000)
+                elif dice < bcShare + twoDigitShare:
+                    year = self._random.randrange(1, 100)
+                else:
+                    year = None
+                if year is None:
+                    scene.date = start.date().isoformat()
+                    scene.time = start.time().isoformat()
+                    scene.lastsDays = str(duration.days)
+                    scene.lastsHours = str(duration.seconds // 3600)
+                    scene.lastsMinutes = str((duration.seconds % 3600) // 60)
+                    end = start + duration
+                    self._eventDates[scId] = (start.isoformat(' '), end.isoformat(' '))
+                else:
+                    scene.date = Scene.NULL_DATE
+                    scene.time = Scene.NULL_TIME
+                    monthDay = start.strftime('%m-%d %H:%M:%S')
+                    self._eventDates[scId] = (f'{year}-{monthDay}', f'{year}-{monthDay}')
+                self.novel.scenes[scId] = scene
+                self.novel.chapters[chId].srtScenes.append(scId)
+
+    def write_yw7(self, filePath):
+        """Write the yWriter project.
+
+        Positional arguments:
+            filePath: str -- path to the yw7 file.
+        """
+        ywFile = Yw7File(filePath)
+        ywFile.novel = self.novel
+        ywFile.write()
+
+    def write_timeline(self, filePath, outline=False):
+        """Write the timeline.
+
+        Positional arguments:
+            filePath: str -- path to the timeline file.
+
+        Optional arguments:
+            outline: bool -- if True, label the scene events with "Scene" instead of the scene IDs.
+        """
+        lines = [
+            "<?xml version='1.0' encoding='utf-8'?>",
+            '<timeline>',
+            '  <version>2.4.0 (3f207fbb63f0 2021-04-07)</version>',
+            '  <timetype>gregoriantime</timetype>',
+            '  <categories>',
+            '    <category>',
+            '      <name>Item</name>',
+            '      <color>160,230,250</color>',
+            '      <progress_color>255,153,153</progress_color>',
+            '      <done_color>255,153,153</done_color>',
+            '      <font_color>0,0,0</font_color>',
+            '    </category>',
+            '  </categories>',
+            '  <events>',
+            ]
+        eventRandom = random.Random(self.sceneCount)
+        nonSceneEvents = self._nonSceneEvents
+        for chId in self.novel.srtChapters:
+            for scId in self.novel.chapters[chId].srtScenes:
+                if nonSceneEvents and eventRandom.random() < 0.5:
+                    nonSceneEvents -= 1
+                    lines.extend(self._get_event_lines(*self._eventDates[scId], f'Event {nonSceneEvents}',
+                                                       self.novel.scenes[scId].desc, None, EVENT_COLOR, 'Item'))
+                if outline:
+                    label = 'Scene'
+                else:
+                    label = f'ScID:{scId}'
+                lines.extend(self._get_event_lines(*self._eventDates[scId], self.novel.scenes[scId].title,
+                                                   self.novel.scenes[scId].desc, label, SCENE_COLOR, None))
+        for i in range(nonSceneEvents):
+            lines.extend(self._get_event_lines('2021-01-01 00:00:00', '2021-01-01 00:00:00', f'Event {i}',
+                                               None, None, EVENT_COLOR, 'Item'))
+        lines.extend([
+            '  </events>',
+            '  <view>',
+            '    <displayed_period>',
+            '      <start>2020-12-01 00:00:00</start>',
+            '      <end>2026-01-31 00:00:00</end>',
+            '    </displayed_period>',
+            '    <hidden_categories>',
+            '    </hidden_categories>',
+            '  </view>',
+            '</timeline>',
+            '',
+            ])
+        with open(filePath, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines))
+
+    def _get_event_lines(self, start, end, text, description, labels, color, category):
+        """Return a list of the lines of a Timeline event."""
+        lines = [
+            '    <event>',
+            f'      <start>{start}</start>',
+            f'      <end>{end}</end>',
+            f'      <text>{text}</text>',
+            '      <progress>0</progress>',
+            '      <fuzzy>False</fuzzy>',
+            '      <locked>False</locked>',
+            '      <ends_today>False</ends_today>',
+            ]
+        if category is not None:
+            lines.append(f'      <category>{category}</category>')
+        if description is not None:
+            lines.append(f'      <description>{description}</description>')
+        if labels is not None:
+            lines.append(f'      <labels>{labels}</labels>')
+        lines.extend([
+            f'      <default_color>{color}</default_color>',
+            '    </event>',
+            ])
+        return lines
+
+    def _get_text(self, wordCount):
+        """Return scene text with paragraphs of up to 100 words."""
+        paragraphs = []
+        while wordCount > 0:
+            paragraphs.append(f'{self._get_words(min(wordCount, 100)).capitalize()}.')
+            wordCount -= 100
+        return '\n'.join(paragraphs)
+
+    def _get_words(self, wordCount):
+        """Return a string of random words."""
+        return ' '.join(self._random.choices(WORDS, k=wordCount))
@@ -0,0 +1,187 @@
+"""Run timed synchronization scenarios on synthetic projects.
+
+Each scenario runs the converter in a fresh process, so the peak memory
+usage (resident set size) can be measured per scenario.
+
+Scenarios:
+    create -- create a new timeline from a yWriter project.
+    export -- update an existing timeline from a yWriter project.
+    import -- update an existing yWriter project from a timeline.
+    outline -- create a new yWriter project from a timeline outline.
+
+usage: python -m benchmark.run_benchmarks [options]  (from the repository root)
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from benchmark.generator import ProjectGenerator
+from pywriter.ui.ui import Ui
+from ywtimelinelib.tl_converter import TlConverter
+
+SCENARIOS = ('create', 'export', 'import', 'outline')
+KWARGS = dict(
+    suffix='',
+    scene_label='Scene',
+    default_date_time='2021-07-26 00:00:00',
+    scene_color='170,240,160',
+    ignore_unspecific=False,
+    dhm_to_datetime=False,
+    datetime_to_dhm=False,
+)
+
+
+def get_peak_rss():
+    """Return the peak resident set size of the current process in MiB, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows.
+        return None
+
+    peakRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        # macOS reports bytes, Linux reports KiB.
+        return peakRss / 2 ** 20
+
+    return peakRss / 2 ** 10
+
+
+def prepare(scenario, generator, workDir):
+    """Write the project files for a scenario and return the source path."""
+    yw7Path = f'{workDir}/{scenario}.yw7'
+    timelinePath = f'{workDir}/{scenario}.timeline'
+    if scenario == 'create':
+        generator.write_yw7(yw7Path)
+        return yw7Path
+
+    if scenario == 'export':
+        generator.write_yw7(yw7Path)
+        generator.write_timeline(timelinePath)
+        return yw7Path
+
+    if scenario == 'import':
+        generator.write_yw7(yw7Path)
+        generator.write_timeline(timelinePath)
+        return timelinePath
+
+    if scenario == 'outline':
+        generator.write_timeline(timelinePath, outline=True)
+        return timelinePath
+
+    raise ValueError(f'Unknown scenario: {scenario}')
+
+
+def convert(sourcePath, kwargs):
+    """Run the converter and return a tuple of message, seconds, and peak RSS.
+
+    To be executed in a fresh process.
+    """
+    converter = TlConverter()
+    converter.ui = Ui('')
+    startTime = time.perf_counter()
+    converter.run(sourcePath, **kwargs)
+    seconds = time.perf_counter() - startTime
+    return converter.ui.infoHowText, seconds, get_peak_rss()
+
+
+def run_scenario(scenario, generator, workDir, kwargs=KWARGS):
+    """Run a scenario and return a result dictionary."""
+    sourcePath = prepare(scenario, generator, workDir)
+    fileName, __ = os.path.splitext(sourcePath)
+    bytesRead = 0
+    for extension in ('.yw7', '.timeline'):
+        if os.path.isfile(f'{fileName}{extension}'):
+            bytesRead += os.path.getsize(f'{fileName}{extension}')
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        message, seconds, peakRss = executor.submit(convert, sourcePath, kwargs).result()
+    if message.startswith('FAIL'):
+        raise RuntimeError(f'{scenario}: {message}')
+
+    return dict(
+        scenario=scenario,
+        scenes=generator.sceneCount,
+        seconds=round(seconds, 4),
+        scenesPerSecond=round(generator.sceneCount / seconds, 1),
+        megabytesPerSecond=round(bytesRead / 2 ** 20 / seconds, 3),
+        peakRssMiB=None if peakRss is None else round(peakRss, 1),
+        )
+
+
+def compare(results, baseline, tolerance):
+    """Print the changes against a baseline and return the list of regressed scenarios."""
+    regressions = []
+    baselineResults = {(result['scenario'], result['scenes']): result for result in baseline['results']}
+    for result in results:
+        reference = baselineResults.get((result['scenario'], result['scenes']))
+        if reference is None:
+            continue
+
+        ratio = result['seconds'] / reference['seconds']
+        print(f'{result["scenario"]:<8} {result["scenes"]:>8} {ratio:>9.2f}x time vs. baseline')
+        if ratio > 1 + tolerance:
+            regressions.append(result['scenario'])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run yw-timeline benchmarks on synthetic projects.')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS,
+                        help='scenario to run (repeatable; default: all)')
+    parser.add_argument('--chapters', type=int, default=100)
+    parser.add_argument('--scenes', type=int, nargs='+', default=[10],
+                        help='scenes per chapter (several values for a scaling series)')
+    parser.add_argument('--characters', type=int, default=50)
+    parser.add_argument('--words', type=int, default=500, help='words per scene')
+    parser.add_argument('--bc-share', type=float, default=0.05)
+    parser.add_argument('--two-digit-share', type=float, default=0.05)
+    parser.add_argument('--non-scene-events', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='FILE', help='write the results to a JSON file')
+    parser.add_argument('--compare', metavar='FILE', help='compare with the results of a previous run')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='maximum relative slowdown against the baseline (default: 0.25)')
+    args = parser.parse_args()
+    results = []
+    print(f'{"scenario":<8} {"scenes":>8} {"seconds":>9} {"scenes/s":>10} {"MiB/s":>8} {"peak MiB":>9}')
+    for scenesPerChapter in args.scenes:
+        generator = ProjectGenerator(
+            chapters=args.chapters,
+            scenesPerChapter=scenesPerChapter,
+            characters=args.characters,
+            wordsPerScene=args.words,
+            bcShare=args.bc_share,
+            twoDigitShare=args.two_digit_share,
+            nonSceneEvents=args.non_scene_events,
+            seed=args.seed,
+            )
+        for scenario in args.scenario or SCENARIOS:
+            with tempfile.TemporaryDirectory() as workDir:
+                result = run_scenario(scenario, generator, workDir)
+            results.append(result)
+            peakRss = '-' if result['peakRssMiB'] is None else f'{result["peakRssMiB"]:.1f}'
+            print(f'{result["scenario"]:<8} {result["scenes"]:>8} {result["seconds"]:>9.3f} '
+                  f'{result["scenesPerSecond"]:>10.0f} {result["megabytesPerSecond"]:>8.2f} {peakRss:>9}')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dict(arguments=vars(args), results=results), f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f'Regressions: {", ".join(regressions)}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
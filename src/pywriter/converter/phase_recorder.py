@@ -0,0 +1,163 @@
+"""Provide a class for measuring the phases of a conversion.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import json
+import time
+import tracemalloc
+from pywriter.pywriter_globals import *
+
+_activeRecorder = None
+# The PhaseRecorder instance measuring the phases, if any.
+
+
+class _Phase:
+    """Context manager for a measured phase."""
+
+    def __init__(self, recorder, name, filePath):
+        self._recorder = recorder
+        self._name = name
+        self._filePath = filePath
+
+    def __enter__(self):
+        self._recorder._enter(self._name, self._filePath)
+        return self
+
+    def __exit__(self, *args):
+        self._recorder._exit()
+        return False
+
+
+class _NoPhase:
+    """Context manager doing nothing, used when no recorder is active."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name, filePath=None):
+    """Return a context manager measuring a phase with the active recorder, if any.
+
+    Positional arguments:
+        name: str -- phase name.
+
+    Optional arguments:
+        filePath: str -- path of the file processed; default: the enclosing phase's file.
+    """
+    if _activeRecorder is None:
+        return _NO_PHASE
+
+    return _Phase(_activeRecorder, name, filePath)
+
+
+class PhaseRecorder:
+    """Recorder for wall time, CPU time, and memory peak per phase and file.
+
+    Public methods:
+        start() -- activate the recorder.
+        stop() -- deactivate the recorder.
+        get_table() -- return the records as a text table.
+        get_json() -- return the records as a JSON string.
+
+    Public instance variables:
+        records: list of dict -- one record per phase and file, in the order of first occurrence.
+
+    Phases are measured where the code is wrapped with phase().
+    Nested phases are recorded with their parents' names.
+    Repeated phases are summed up.
+    The memory peak is taken from tracemalloc, which slows down the conversion considerably.
+    """
+
+    def __init__(self, traceMemory=True):
+        """Initialize instance variables.
+
+        Optional arguments:
+            traceMemory: bool -- if True, measure the memory peak with tracemalloc.
+        """
+        self.records = []
+        self._recordsByKey = {}
+        self._stack = []
+        self._traceMemory = traceMemory
+        self._startedTracing = False
+
+    def start(self):
+        """Activate the recorder."""
+        global _activeRecorder
+        _activeRecorder = self
+        if self._traceMemory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._startedTracing = True
+
+    def stop(self):
+        """Deactivate the recorder."""
+        global _activeRecorder
+        if _activeRecorder is self:
+            _activeRecorder = None
+        if self._startedTracing:
+            tracemalloc.stop()
+            self._startedTracing = False
+
+    def get_table(self):
+        """Return the records as a text table."""
+        lines = [f'{"phase":<32} {"calls":>6} {"wall s":>9} {"CPU s":>9} {"peak MiB":>9}  file']
+        for record in self.records:
+            if record['peakBytes'] is None:
+                peak = '-'
+            else:
+                peak = f'{record["peakBytes"] / 2 ** 20:.2f}'
+            name = f'{"  " * (len(record["phase"]) - 1)}{record["phase"][-1]}'
+            lines.append(f'{name:<32} {record["calls"]:>6} {record["wallSeconds"]:>9.4f} '
+                         f'{record["cpuSeconds"]:>9.4f} {peak:>9}  {norm_path(record["filePath"])}')
+        return '\n'.join(lines)
+
+    def get_json(self):
+        """Return the records as a JSON string."""
+        return json.dumps(self.records, indent=2)
+
+    def _enter(self, name, filePath):
+        """Begin measuring a phase."""
+        if filePath is None and self._stack:
+            filePath = self._stack[-1]['filePath']
+        names = (self._stack[-1]['names'] if self._stack else ()) + (name,)
+        key = (filePath, names)
+        record = self._recordsByKey.get(key)
+        if record is None:
+            record = dict(phase=names, filePath=filePath, calls=0,
+                          wallSeconds=0.0, cpuSeconds=0.0, peakBytes=None)
+            self._recordsByKey[key] = record
+            self.records.append(record)
+        frame = dict(record=record, names=names, filePath=filePath, peak=0, memory=0)
+        if tracemalloc.is_tracing():
+            memory, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            frame['memory'] = memory
+            if hasattr(tracemalloc, 'reset_peak'):
+                # Python 3.9+
+                tracemalloc.reset_peak()
+        self._stack.append(frame)
+        frame['cpu'] = time.process_time()
+        frame['wall'] = time.perf_counter()
+
+    def _exit(self):
+        """Finish measuring a phase and update its record."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        frame = self._stack.pop()
+        record = frame['record']
+        record['calls'] += 1
+        record['wallSeconds'] += wall - frame['wall']
+        record['cpuSeconds'] += cpu - frame['cpu']
+        if tracemalloc.is_tracing():
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            record['peakBytes'] = max(record['peakBytes'] or 0, peak - frame['memory'])
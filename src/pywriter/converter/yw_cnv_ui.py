@@ -12,6 +12,7 @@ from pywriter.pywriter_globals import *
 from pywriter.file.doc_open import open_document
 from pywriter.ui.ui import Ui
 from pywriter.model.novel import Novel
+from pywriter.converter.phase_recorder import phase
 
 
 class YwCnvUi:
@@ -25,6 +26,9 @@ class YwCnvUi:
     Instance variables:
         ui -- Ui (can be overridden e.g. by subclasses).
         newFile: str -- path to the target file in case of success.   
+        journal -- synchronization journal, if any (can be set e.g. by subclasses).
+        recorder -- PhaseRecorder measuring the conversion phases, if any.
+        bytesRead: int -- number of bytes read from the source and target files by the last conversion.
     """
 
     def __init__(self):
@@ -33,6 +37,11 @@ class YwCnvUi:
         # Per default, 'silent mode' is active.
         self.newFile = None
         # Also indicates successful conversion.
+        self.journal = None
+        # If set, unchanged targets are not rewritten.
+        self.recorder = None
+        # If set, the phases of the conversions are measured.
+        self.bytesRead = 0
 
     def export_from_yw(self, source, target):
         """Convert from yWriter project to other file format.
@@ -53,18 +62,24 @@ class YwCnvUi:
         self.ui.set_info_what(
             _('Input: {0} "{1}"\nOutput: {2} "{3}"').format(source.DESCRIPTION, norm_path(source.filePath), target.DESCRIPTION, norm_path(target.filePath)))
         try:
-            self.check(source, target)
-            source.novel = Novel()
-            source.read()
-            target.novel = source.novel
-            target.write()
+            if self.journal is not None and self.journal.is_up_to_date(source, target):
+                message = f'{_("File is up to date")}: "{norm_path(target.filePath)}".'
+            else:
+                self.check(source, target)
+                source.novel = Novel()
+                self._start_recorder()
+                with phase('read', source.filePath):
+                    source.read()
+                target.novel = source.novel
+                message = self._write_changes(source, target)
         except Exception as ex:
             message = f'!{str(ex)}'
             self.newFile = None
         else:
-            message = f'{_("File written")}: "{norm_path(target.filePath)}".'
             self.newFile = target.filePath
         finally:
+            self._stop_recorder()
+            self.bytesRead = source.bytesRead + target.bytesRead
             self.ui.set_info_how(message)
 
     def create_yw7(self, source, target):
@@ -93,9 +108,12 @@ class YwCnvUi:
             try:
                 self.check(source, target)
                 source.novel = Novel()
-                source.read()
+                self._start_recorder()
+                with phase('read', source.filePath):
+                    source.read()
                 target.novel = source.novel
-                target.write()
+                with phase('write', target.filePath):
+                    target.write()
             except Exception as ex:
                 message = f'!{str(ex)}'
                 self.newFile = None
@@ -103,6 +121,8 @@ class YwCnvUi:
                 message = f'{_("File written")}: "{norm_path(target.filePath)}".'
                 self.newFile = target.filePath
             finally:
+                self._stop_recorder()
+                self.bytesRead = source.bytesRead + target.bytesRead
                 self.ui.set_info_how(message)
 
     def import_to_yw(self, source, target):
@@ -126,23 +146,60 @@ class YwCnvUi:
             _('Input: {0} "{1}"\nOutput: {2} "{3}"').format(source.DESCRIPTION, norm_path(source.filePath), target.DESCRIPTION, norm_path(target.filePath)))
         self.newFile = None
         try:
-            self.check(source, target)
-            target.novel = Novel()
-            target.read()
-            source.novel = target.novel
-            source.read()
-            target.novel = source.novel
-            target.write()
+            if self.journal is not None and self.journal.is_up_to_date(source, target):
+                message = f'{_("File is up to date")}: "{norm_path(target.filePath)}".'
+            else:
+                self.check(source, target)
+                target.novel = Novel()
+                self._start_recorder()
+                with phase('read', target.filePath):
+                    target.read()
+                source.novel = target.novel
+                with phase('read', source.filePath):
+                    source.read()
+                target.novel = source.novel
+                message = self._write_changes(source, target)
         except Exception as ex:
             message = f'!{str(ex)}'
         else:
-            message = f'{_("File written")}: "{norm_path(target.filePath)}".'
             self.newFile = target.filePath
             if source.scenesSplit:
                 self.ui.show_warning(_('New scenes created during conversion.'))
         finally:
+            self._stop_recorder()
+            self.bytesRead = source.bytesRead + target.bytesRead
             self.ui.set_info_how(message)
 
+    def _start_recorder(self):
+        """Activate the phase recorder, if any."""
+        if self.recorder is not None:
+            self.recorder.start()
+
+    def _stop_recorder(self):
+        """Deactivate the phase recorder, if any."""
+        if self.recorder is not None:
+            self.recorder.stop()
+
+    def _write_changes(self, source, target):
+        """Write the target file, if changed since the last synchronization, and return a message.
+        
+        Positional arguments:
+            source -- Any Novel subclass instance, already read.
+            target -- Any Novel subclass instance.
+
+        Without a journal, the target file is always written.
+        Raise the "Error" exception in case of error. 
+        """
+        if self.journal is not None and not self.journal.has_changes(source, target):
+            message = f'{_("File is up to date")}: "{norm_path(target.filePath)}".'
+        else:
+            with phase('write', target.filePath):
+                target.write()
+            message = f'{_("File written")}: "{norm_path(target.filePath)}".'
+        if self.journal is not None:
+            self.journal.update(source, target)
+        return message
+
     def _confirm_overwrite(self, filePath):
         """Return boolean permission to overwrite the target file.
         
@@ -0,0 +1,104 @@
+"""Provide a context manager for crash-safe file writing.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import shutil
+from secrets import token_hex
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(filePath, backupPath=None):
+    """Return a context manager for replacing a file atomically, yielding a temporary file path to write to.
+
+    Positional arguments:
+        filePath: str -- path to the file to be written.
+
+    Optional arguments:
+        backupPath: str -- path to the backup of the existing file, if any.
+
+    The content is written to a temporary file in the same directory.
+    On leaving the context, the temporary file is flushed to disk, the existing file 
+    is backed up, and the temporary file is renamed to filePath in a single step. 
+    So there is always a complete file at filePath, even if the process is killed, 
+    or the writer raises an exception. In this case, the temporary file is deleted, 
+    and the existing file and its backup are left unchanged.
+    The backup is a hard link to the existing file, if the file system allows. 
+    Otherwise, the existing file is copied.
+    """
+    dirPath = os.path.dirname(os.path.abspath(filePath))
+    tempPath = _create_temp_file(filePath)
+    try:
+        if os.path.isfile(filePath):
+            shutil.copymode(filePath, tempPath)
+        yield tempPath
+
+        _sync_file(tempPath)
+        if backupPath is not None and os.path.isfile(filePath):
+            _back_up(filePath, backupPath)
+        os.replace(tempPath, filePath)
+    except:
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+        raise
+
+    _sync_directory(dirPath)
+
+
+def _back_up(filePath, backupPath):
+    """Replace the backup with a hard link to the file, or with a copy."""
+    tempPath = f'{backupPath}.{token_hex(4)}.tmp'
+    try:
+        os.link(filePath, tempPath)
+    except (OSError, AttributeError, NotImplementedError):
+        shutil.copy2(filePath, tempPath)
+    try:
+        os.replace(tempPath, backupPath)
+    except:
+        os.remove(tempPath)
+        raise
+
+
+def _create_temp_file(filePath):
+    """Create an empty file next to filePath and return its path.
+    
+    The file gets the default permissions, unlike files created by the tempfile module.
+    """
+    while True:
+        tempPath = f'{filePath}.{token_hex(4)}.tmp'
+        try:
+            os.close(os.open(tempPath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            return tempPath
+
+        except FileExistsError:
+            pass
+
+
+def _sync_directory(dirPath):
+    """Flush the directory entries to disk, where supported."""
+    try:
+        fd = os.open(dirPath, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on Windows.
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _sync_file(filePath):
+    """Flush the file's content to disk."""
+    fd = os.open(filePath, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,134 @@
+"""Provide a class for numbered backups, compressed in the background.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import re
+import gzip
+import shutil
+import threading
+from pywriter.file.atomic_write import atomic_write
+
+
+class BackupRotation:
+    """Numbered backups of a file.
+
+    Public methods:
+        get_backup_path() -- return the path for the next backup.
+        rotate() -- compress and delete the older backups in the background.
+
+    Public class methods:
+        wait() -- wait until the background jobs are done.
+
+    Public instance variables:
+        filePath: str -- path to the file backed up.
+        maxCount: int -- number of backups kept; 0 means all.
+
+    The backups are numbered like "project.yw7.bk0001", the latest having the highest number.
+    The latest backup is kept as it is, because it is just a hard link to the replaced file.
+    The older backups are compressed with gzip, like "project.yw7.bk0001.gz".
+    This is done in a background thread, so the caller can return as soon as
+    the file is written. The thread is not a daemon, so the program finishes 
+    the job before it exits. 
+    """
+    DEFAULT_COUNT = 10
+    COMPRESSION_LEVEL = 6
+    # gzip compression level; 9 takes much longer for little gain.
+
+    _lock = threading.Lock()
+    # Serializes the background jobs.
+    _threads = []
+
+    def __init__(self, filePath, maxCount=None):
+        """Set the file path and the number of backups kept.
+
+        Positional arguments:
+            filePath: str -- path to the file backed up.
+
+        Optional arguments:
+            maxCount: int or numeric str -- number of backups kept; 0 means all. Default: DEFAULT_COUNT.
+        """
+        self.filePath = filePath
+        try:
+            self.maxCount = max(int(maxCount), 0)
+        except (TypeError, ValueError):
+            self.maxCount = self.DEFAULT_COUNT
+        self._pattern = re.compile(rf'{re.escape(os.path.basename(filePath))}\.bk([0-9]{{4,}})(\.gz)?$')
+
+    def get_backup_path(self):
+        """Return the path for the next backup, numbered after the existing ones."""
+        numbers = self._get_backups()
+        if numbers:
+            number = max(numbers) + 1
+        else:
+            number = 1
+        return self._get_path(number)
+
+    def rotate(self):
+        """Start compressing the older backups and deleting the ones exceeding maxCount."""
+        thread = threading.Thread(target=self._rotate, name=f'BackupRotation {self.filePath}')
+        self._threads.append(thread)
+        thread.start()
+
+    @classmethod
+    def wait(cls):
+        """Wait until the background jobs are done."""
+        while cls._threads:
+            cls._threads.pop().join()
+
+    def _compress(self, number):
+        """Replace an uncompressed backup with its gzip compressed version."""
+        backupPath = self._get_path(number)
+        if not os.path.isfile(f'{backupPath}.gz'):
+            with atomic_write(f'{backupPath}.gz') as tempPath:
+                with open(backupPath, 'rb') as f:
+                    with gzip.open(tempPath, 'wb', compresslevel=self.COMPRESSION_LEVEL) as g:
+                        shutil.copyfileobj(f, g, 2 ** 20)
+            shutil.copystat(backupPath, f'{backupPath}.gz')
+        os.remove(backupPath)
+
+    def _get_backups(self):
+        """Return a dictionary of the existing backups.
+        
+        key: number, value: set of the extensions, i.e. '' and/or '.gz'.
+        """
+        backups = {}
+        try:
+            fileNames = os.listdir(os.path.dirname(os.path.abspath(self.filePath)))
+        except OSError:
+            return backups
+
+        for fileName in fileNames:
+            match = self._pattern.match(fileName)
+            if match is not None:
+                backups.setdefault(int(match.group(1)), set()).add(match.group(2) or '')
+        return backups
+
+    def _get_path(self, number):
+        """Return the path of the numbered backup, without compression extension."""
+        return f'{self.filePath}.bk{number:04}'
+
+    def _rotate(self):
+        """Compress the older backups and delete the ones exceeding maxCount.
+        
+        Errors are ignored, so the next rotation tries again.
+        """
+        with self._lock:
+            backups = self._get_backups()
+            numbers = sorted(backups)
+            if self.maxCount:
+                for number in numbers[:-self.maxCount]:
+                    for extension in backups[number]:
+                        try:
+                            os.remove(f'{self._get_path(number)}{extension}')
+                        except OSError:
+                            pass
+                numbers = numbers[-self.maxCount:]
+            for number in numbers[:-1]:
+                if '' in backups[number]:
+                    try:
+                        self._compress(number)
+                    except Exception:
+                        pass
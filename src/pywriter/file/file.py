@@ -10,6 +10,8 @@ from abc import ABC
 from urllib.parse import quote
 import os
 from pywriter.pywriter_globals import *
+from pywriter.file.project_cache import ProjectCache
+from pywriter.file.backup_rotation import BackupRotation
 
 
 class File(ABC):
@@ -28,6 +30,7 @@ class File(ABC):
         projectPath: str -- URL-coded path to the project directory. 
         scenesSplit: bool -- True, if a scene or chapter is split during merging.
         filePath: str -- path to the file (property with getter and setter). 
+        bytesRead: int -- number of bytes read from the file, including the project cache's hashing (read-only property).
 
     Public class constants:
         PRJ_KWVAR -- List of the names of the project keyword variables.
@@ -60,9 +63,30 @@ class File(ABC):
             
         Optional arguments:
             kwargs -- keyword arguments to be used by subclasses.  
+
+        Optional keyword arguments:
+            project_cache: bool -- keep the parsed file contents in an on-disk cache.
+            cache_dir: str -- cache directory; default: ProjectCache.DEFAULT_DIR.
+            cache_size: str -- cache size budget in MiB; default: ProjectCache.DEFAULT_SIZE.
+            indent_xml: bool -- if False, do not pretty-print XML files when writing; default: True.
+            single_backup: bool -- if False, keep numbered backups when overwriting; default: True.
+            backup_count: str -- number of numbered backups kept; default: BackupRotation.DEFAULT_COUNT.
         """
         self.novel = None
 
+        if kwargs.get('project_cache', False):
+            self._cache = ProjectCache(kwargs.get('cache_dir', None), kwargs.get('cache_size', None))
+        else:
+            self._cache = None
+        # ProjectCache instance to be consulted by the subclasses' read() method, if any.
+
+        self._indentXml = kwargs.get('indent_xml', True)
+        # If False, the subclasses' write() method leaves the XML formatting as it is.
+
+        self._singleBackup = kwargs.get('single_backup', True)
+        self._backupCount = kwargs.get('backup_count', None)
+        # If single_backup is False, the subclasses' write() method keeps numbered backups.
+
         self._filePath = None
         # str
         # Path to the file. The setter only accepts files of a supported type as specified by EXTENSION.
@@ -78,6 +102,17 @@ class File(ABC):
         self.scenesSplit = False
         self.filePath = filePath
 
+        self._bytesRead = 0
+        # int
+        # Number of bytes read from the file by the subclasses' read() and write() methods.
+
+    @property
+    def bytesRead(self):
+        if self._cache is None:
+            return self._bytesRead
+
+        return self._bytesRead + self._cache.bytesRead
+
     @property
     def filePath(self):
         return self._filePath
@@ -120,6 +155,26 @@ class File(ABC):
         """
         raise NotImplementedError
 
+    def _get_backup_path(self, filePath):
+        """Return the path for backing up a file before overwriting it.
+        
+        Positional arguments:
+            filePath: str -- path to the file to be overwritten.
+        """
+        if self._singleBackup:
+            return f'{filePath}.bak'
+
+        return BackupRotation(filePath, self._backupCount).get_backup_path()
+
+    def _rotate_backups(self, filePath):
+        """Compress and delete the older numbered backups in the background, if any.
+        
+        Positional arguments:
+            filePath: str -- path to the file just overwritten.
+        """
+        if not self._singleBackup:
+            BackupRotation(filePath, self._backupCount).rotate()
+
     def _convert_from_yw(self, text, quick=False):
         """Return text, converted from yw7 markup to target format.
         
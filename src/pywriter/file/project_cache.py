@@ -0,0 +1,171 @@
+"""Provide a class for an on-disk cache of parsed project files.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import zlib
+import pickle
+import tempfile
+from hashlib import sha1
+from pywriter.pywriter_globals import *
+
+
+class ProjectCache:
+    """Cache of the data parsed from project files, stored in a directory.
+
+    Public methods:
+        get(filePath, variant) -- return the cached data of a file, or None.
+        put(filePath, variant, data) -- store the data parsed from a file.
+
+    Public instance variables:
+        cacheDir: str -- directory holding the cache entries.
+        maxBytes: int -- size budget of all cache entries.
+        bytesRead: int -- number of bytes read from the project files for hashing.
+
+    An entry is valid as long as the file's path, size, modification time,
+    and content hash are the same as when it was stored. So a file saved by
+    yWriter or Timeline is parsed again, even if its size and time stamp remain the same.
+    The entries are compressed pickles. When exceeding the size budget,
+    the least recently used entries are deleted.
+    The cache never fails a conversion: if an entry can not be read or written,
+    the file is just parsed as usual.
+    """
+    EXTENSION = '.pwcache'
+    FORMAT = 2
+    # To be incremented when the cached data structures change.
+
+    DEFAULT_DIR = os.path.join(os.path.expanduser('~'), '.pywriter', 'cache')
+    DEFAULT_SIZE = 100
+    # Megabytes.
+
+    def __init__(self, cacheDir=None, maxMegabytes=None):
+        """Set the cache location and size budget.
+
+        Optional arguments:
+            cacheDir: str -- directory holding the cache entries. Default: DEFAULT_DIR.
+            maxMegabytes: int or numeric str -- size budget in MiB. Default: DEFAULT_SIZE.
+        """
+        if not cacheDir:
+            cacheDir = self.DEFAULT_DIR
+        self.cacheDir = cacheDir
+        try:
+            maxMegabytes = float(maxMegabytes)
+        except (TypeError, ValueError):
+            maxMegabytes = self.DEFAULT_SIZE
+        self.maxBytes = int(maxMegabytes * 2 ** 20)
+        self.bytesRead = 0
+        self._missed = {}
+        # key: entry path, value: file status when the entry was missed.
+
+    def get(self, filePath, variant):
+        """Return the data parsed from a file, or None if not cached.
+
+        Positional arguments:
+            filePath: str -- path to the project file.
+            variant: str -- identifies the parser and its settings.
+        """
+        entryPath = self._get_entry_path(filePath, variant)
+        try:
+            self._missed[entryPath] = self._get_status(filePath)
+            with open(entryPath, 'rb') as f:
+                header = pickle.load(f)
+                if header != self._get_header(filePath, variant, header['digest']):
+                    return None
+
+                if header['digest'] != self._get_digest(filePath):
+                    return None
+
+                data = pickle.loads(zlib.decompress(f.read()))
+            del self._missed[entryPath]
+            os.utime(entryPath)
+            # Mark the entry as recently used.
+            return data
+
+        except Exception:
+            return None
+
+    def put(self, filePath, variant, data):
+        """Store the data parsed from a file.
+
+        Positional arguments:
+            filePath: str -- path to the project file.
+            variant: str -- identifies the parser and its settings.
+            data -- picklable data parsed from the file.
+
+        The data is only stored after a get() miss, and if the file
+        has not changed since, so the entry matches the parsed content.
+        """
+        entryPath = self._get_entry_path(filePath, variant)
+        try:
+            if self._missed.pop(entryPath) != self._get_status(filePath):
+                return
+
+            header = self._get_header(filePath, variant, self._get_digest(filePath))
+            payload = zlib.compress(pickle.dumps(data, pickle.HIGHEST_PROTOCOL), 1)
+            os.makedirs(self.cacheDir, exist_ok=True)
+            fd, tempPath = tempfile.mkstemp(dir=self.cacheDir)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+                    f.write(payload)
+                os.replace(tempPath, entryPath)
+            except:
+                os.remove(tempPath)
+                raise
+
+            self._evict()
+        except Exception:
+            pass
+
+    def _evict(self):
+        """Delete the least recently used entries until the size budget is met."""
+        entries = []
+        totalBytes = 0
+        for entry in os.scandir(self.cacheDir):
+            if entry.name.endswith(self.EXTENSION):
+                status = entry.stat()
+                entries.append((status.st_mtime_ns, status.st_size, entry.path))
+                totalBytes += status.st_size
+        entries.sort()
+        for __, size, entryPath in entries:
+            if totalBytes <= self.maxBytes:
+                break
+
+            try:
+                os.remove(entryPath)
+            except OSError:
+                pass
+            totalBytes -= size
+
+    def _get_digest(self, filePath):
+        """Return the SHA-1 hash of the file's content."""
+        digest = sha1()
+        with open(filePath, 'rb') as f:
+            for chunk in iter(lambda: f.read(2 ** 20), b''):
+                digest.update(chunk)
+                self.bytesRead += len(chunk)
+        return digest.hexdigest()
+
+    def _get_entry_path(self, filePath, variant):
+        """Return the path of the cache entry for a file and variant."""
+        key = f'{os.path.normcase(os.path.abspath(filePath))}\n{variant}'
+        return os.path.join(self.cacheDir, f'{sha1(key.encode("utf-8")).hexdigest()}{self.EXTENSION}')
+
+    def _get_header(self, filePath, variant, digest):
+        """Return a dictionary identifying the file's current state."""
+        size, mtime = self._get_status(filePath)
+        return dict(
+            format=self.FORMAT,
+            filePath=os.path.normcase(os.path.abspath(filePath)),
+            variant=variant,
+            size=size,
+            mtime=mtime,
+            digest=digest,
+            )
+
+    def _get_status(self, filePath):
+        """Return a tuple of the file's size and modification time."""
+        status = os.stat(filePath)
+        return status.st_size, status.st_mtime_ns
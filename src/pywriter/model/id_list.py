@@ -0,0 +1,123 @@
+"""Provide a list class for element IDs with constant time membership tests.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+
+
+class IdList(list):
+    """Ordered list of element IDs, indexed for membership tests.
+
+    Public methods:
+        All list methods. The mutating methods update the index.
+
+    IdList is a drop-in replacement for the srt* lists of the Novel class.
+    The "in" operator looks up a hashed index instead of scanning the list,
+    so checking cross-references does not depend on the number of elements.
+    The index counts the occurrences, so duplicate IDs are handled like in a list.
+    """
+
+    def __init__(self, ids=()):
+        """Initialize the list and its index.
+
+        Optional arguments:
+            ids -- iterable of IDs.
+
+        Extends the superclass constructor.
+        """
+        super().__init__(ids)
+        self._count = {}
+        # key: ID, value: number of occurrences.
+        self._add_all(self)
+
+    def __contains__(self, elemId):
+        try:
+            return elemId in self._count
+        except TypeError:
+            # Unhashable type
+            return super().__contains__(elemId)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            oldIds = self[index]
+            value = list(value)
+            newIds = value
+        else:
+            oldIds = (self[index],)
+            newIds = (value,)
+        super().__setitem__(index, value)
+        self._remove_all(oldIds)
+        self._add_all(newIds)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            oldIds = self[index]
+        else:
+            oldIds = (self[index],)
+        super().__delitem__(index)
+        self._remove_all(oldIds)
+
+    def __iadd__(self, ids):
+        self.extend(ids)
+        return self
+
+    def __imul__(self, factor):
+        ids = list(self)
+        super().__imul__(factor)
+        if factor <= 0:
+            self._count.clear()
+        else:
+            for __ in range(factor - 1):
+                self._add_all(ids)
+        return self
+
+    def __copy__(self):
+        return IdList(self)
+
+    def __reduce__(self):
+        return (IdList, (list(self),))
+
+    def append(self, elemId):
+        super().append(elemId)
+        self._count[elemId] = self._count.get(elemId, 0) + 1
+
+    def extend(self, ids):
+        ids = list(ids)
+        super().extend(ids)
+        self._add_all(ids)
+
+    def insert(self, index, elemId):
+        super().insert(index, elemId)
+        self._count[elemId] = self._count.get(elemId, 0) + 1
+
+    def remove(self, elemId):
+        super().remove(elemId)
+        self._remove_all((elemId,))
+
+    def pop(self, index=-1):
+        elemId = super().pop(index)
+        self._remove_all((elemId,))
+        return elemId
+
+    def clear(self):
+        super().clear()
+        self._count.clear()
+
+    def copy(self):
+        return IdList(self)
+
+    def _add_all(self, ids):
+        """Add ids to the index."""
+        count = self._count
+        for elemId in ids:
+            count[elemId] = count.get(elemId, 0) + 1
+
+    def _remove_all(self, ids):
+        """Remove ids from the index."""
+        count = self._count
+        for elemId in ids:
+            if count[elemId] == 1:
+                del count[elemId]
+            else:
+                count[elemId] -= 1
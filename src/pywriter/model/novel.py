@@ -5,11 +5,10 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import locale
-import re
 from pywriter.pywriter_globals import *
 from pywriter.model.basic_element import BasicElement
-
-LANGUAGE_TAG = re.compile(r'\[lang=(.*?)\]')
+from pywriter.model.id_list import IdList
+from pywriter.model.scene import count_words
 
 
 class Novel(BasicElement):
@@ -22,6 +21,7 @@ class Novel(BasicElement):
     Public methods:
         get_languages() -- Determine the languages used in the document.
         check_locale() -- Check the document's locale (language code and country code).
+        count_words(maxWorkers) -- Update the word count and letter count of all scenes.
 
     Public instance variables:
         authorName -- author's name.
@@ -34,13 +34,15 @@ class Novel(BasicElement):
         scenes: dict -- (key: ID, value: scene instance).
         srtChapters: list -- the novel's sorted chapter IDs.
         locations: dict -- (key: ID, value: WorldElement instance).
-        srtLocations: list -- the novel's sorted location IDs.
+        srtLocations: IdList -- the novel's sorted location IDs.
         items: dict -- (key: ID, value: WorldElement instance).
-        srtItems: list -- the novel's sorted item IDs.
+        srtItems: IdList -- the novel's sorted item IDs.
         characters: dict -- (key: ID, value: character instance).
-        srtCharacters: list -- the novel's sorted character IDs.
+        srtCharacters: IdList -- the novel's sorted character IDs.
         projectNotes: dict --  (key: ID, value: projectNote instance).
         srtPrjNotes: list -- the novel's sorted project notes.
+
+    The IdList instances can be checked for IDs in constant time.
     """
 
     def __init__(self):
@@ -101,7 +103,7 @@ class Novel(BasicElement):
         # key = location ID, value = WorldElement instance.
         # The order of the elements does not matter.
 
-        self.srtLocations = []
+        self.srtLocations = IdList()
         # The novel's location IDs. The order of its elements
         # corresponds to the XML project file.
 
@@ -110,7 +112,7 @@ class Novel(BasicElement):
         # key = item ID, value = WorldElement instance.
         # The order of the elements does not matter.
 
-        self.srtItems = []
+        self.srtItems = IdList()
         # The novel's item IDs. The order of its elements corresponds to the XML project file.
 
         self.characters = {}
@@ -118,7 +120,7 @@ class Novel(BasicElement):
         # key = character ID, value = Character instance.
         # The order of the elements does not matter.
 
-        self.srtCharacters = []
+        self.srtCharacters = IdList()
         # The novel's character IDs. The order of its elements corresponds to the XML project file.
 
         self.projectNotes = {}
@@ -142,29 +144,40 @@ class Novel(BasicElement):
         Example:
         - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
         - language code: 'en-AU'
+        
+        The scenes keep their language codes until their content changes, 
+        so only the scenes edited since the last call are scanned.
         """
+        languages = {}
+        # key: language code, value: None. Keeps the order of first occurrence.
+        for scId in self.scenes:
+            for language in self.scenes[scId].languages:
+                languages[language] = None
+        self.languages = list(languages)
 
-        def languages(text):
-            """Return the language codes appearing in text.
-            
-            Example:
-            - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
-            - language code: 'en-AU'
-            """
-            if text:
-                m = LANGUAGE_TAG.search(text)
-                while m:
-                    text = text[m.span()[1]:]
-                    yield m.group(1)
-                    m = LANGUAGE_TAG.search(text)
-
-        self.languages = []
+    def count_words(self, maxWorkers=1):
+        """Update the word count and letter count of all scenes.
+        
+        Optional arguments:
+            maxWorkers: int -- if greater than 1, count in a pool of maxWorkers processes.
+        
+        Scenes count their words on demand. Use this for having all scenes counted at once. 
+        """
+        scIds = []
+        texts = []
         for scId in self.scenes:
-            text = self.scenes[scId].sceneContent
-            if text:
-                for language in languages(text):
-                    if not language in self.languages:
-                        self.languages.append(language)
+            if self.scenes[scId].sceneContent:
+                scIds.append(scId)
+                texts.append(self.scenes[scId].sceneContent)
+        if maxWorkers > 1 and len(texts) > maxWorkers:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=maxWorkers) as executor:
+                counts = list(executor.map(count_words, texts, chunksize=max(1, len(texts) // (maxWorkers * 4))))
+        else:
+            counts = [count_words(text) for text in texts]
+        for scId, (wordCount, letterCount) in zip(scIds, counts):
+            self.scenes[scId].wordCount = wordCount
+            self.scenes[scId].letterCount = letterCount
 
     def check_locale(self):
         """Check the document's locale (language code and country code).
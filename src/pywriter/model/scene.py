@@ -22,14 +22,36 @@ NON_LETTERS = re.compile(r'\[.+?\]|\/\*.+?\*\/|\n|\r')
 # this is to be replaced by empty strings, thus excluding markup, comments, and linefeeds
 # from letter counting
 
+LANGUAGE_TAG = re.compile(r'\[lang=(.*?)\]')
+# Language markup. Example: '[lang=en-AU]'
+
+
+def count_words(text):
+    """Return a tuple of the word count and the letter count of text.
+    
+    Positional arguments:
+        text: str -- scene content with yWriter 7 raw markup.
+    
+    This is a module level function, so it can be run in a process pool.
+    """
+    if not text:
+        return 0, 0
+
+    countText = ADDITIONAL_WORD_LIMITS.sub(' ', text)
+    countText = NO_WORD_LIMITS.sub('', countText)
+    wordCount = len(countText.split())
+    letterCount = len(NON_LETTERS.sub('', text))
+    return wordCount, letterCount
+
 
 class Scene(BasicElement):
     """yWriter scene representation.
     
     Public instance variables:
         sceneContent: str -- scene content (property with getter and setter).
-        wordCount: int -- word count (derived; updated by the sceneContent setter).
-        letterCount: int -- letter count (derived; updated by the sceneContent setter).
+        wordCount: int -- word count (derived; counted on demand after the sceneContent setter is called).
+        letterCount: int -- letter count (derived; counted on demand after the sceneContent setter is called).
+        languages: tuple -- language codes used in the scene content (derived; scanned on demand after the sceneContent setter is called).
         scType: int -- Scene type (Normal/Notes/Todo/Unused).
         doNotExport: bool -- True if the scene is not to be exported to RTF.
         status: int -- scene status (Outline/Draft/1st Edit/2nd Edit/Done).
@@ -87,13 +109,17 @@ class Scene(BasicElement):
         # xml: <SceneContent>
         # Scene text with yW7 raw markup.
 
-        self.wordCount = 0
+        self._wordCount = 0
         # xml: <WordCount>
-        # To be updated by the sceneContent setter
+        # None, if the sceneContent setter has been called since the last counting.
 
-        self.letterCount = 0
+        self._letterCount = 0
         # xml: <LetterCount>
-        # To be updated by the sceneContent setter
+        # None, if the sceneContent setter has been called since the last counting.
+
+        self._languages = None
+        # Language codes in order of first occurrence.
+        # None, if the sceneContent setter has been called since the last scan.
 
         self.scType = None
         # Scene type (Normal/Notes/Todo/Unused).
@@ -220,11 +246,37 @@ class Scene(BasicElement):
 
     @sceneContent.setter
     def sceneContent(self, text: str):
-        """Set sceneContent updating word count and letter count."""
+        """Set sceneContent, invalidating word count, letter count, and languages."""
         self._sceneContent = text
-        text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
-        text = NO_WORD_LIMITS.sub('', text)
-        wordList = text.split()
-        self.wordCount = len(wordList)
-        text = NON_LETTERS.sub('', self._sceneContent)
-        self.letterCount = len(text)
+        self._wordCount = None
+        self._letterCount = None
+        self._languages = None
+
+    @property
+    def wordCount(self):
+        if self._wordCount is None:
+            self._wordCount, self._letterCount = count_words(self._sceneContent)
+        return self._wordCount
+
+    @wordCount.setter
+    def wordCount(self, count: int):
+        self._wordCount = count
+
+    @property
+    def letterCount(self):
+        if self._letterCount is None:
+            self._wordCount, self._letterCount = count_words(self._sceneContent)
+        return self._letterCount
+
+    @letterCount.setter
+    def letterCount(self, count: int):
+        self._letterCount = count
+
+    @property
+    def languages(self):
+        if self._languages is None:
+            if self._sceneContent:
+                self._languages = tuple(dict.fromkeys(match.group(1) for match in LANGUAGE_TAG.finditer(self._sceneContent)))
+            else:
+                self._languages = ()
+        return self._languages
@@ -8,6 +8,7 @@ import os
 import sys
 import gettext
 import locale
+import importlib.util
 
 __all__ = ['Error',
            '_',
@@ -16,6 +17,7 @@ __all__ = ['Error',
            'norm_path',
            'string_to_list',
            'list_to_string',
+           'lazy_import',
            ]
 
 
@@ -95,3 +97,29 @@ def list_to_string(elements, divider=';'):
     except:
         return ''
 
+
+def lazy_import(name):
+    """Return a module that is executed on first attribute access, or None if not installed.
+    
+    Positional arguments:
+        name: str -- name of a top-level module or package.
+        
+    Use this for optional or big modules that are needed by some code paths only,
+    such as GUI toolkits, so startup does not pay for them.
+    If the module is already imported, return it.
+    """
+    try:
+        return sys.modules[name]
+
+    except KeyError:
+        pass
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -6,7 +6,9 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import os
 import sys
-import tkinter as tk
+from pywriter.pywriter_globals import *
+
+tk = lazy_import('tkinter')
 
 
 def set_icon(widget, icon='logo', path=None, default=True):
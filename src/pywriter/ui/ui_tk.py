@@ -4,11 +4,12 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
-import tkinter as tk
-from tkinter import messagebox
 from pywriter.pywriter_globals import *
 from pywriter.ui.ui import Ui
 
+tk = lazy_import('tkinter')
+# Executed when the first window is created, so silent runs do not load Tk.
+
 
 class UiTk(Ui):
     """UI subclass implementing a Tkinter facade.
@@ -55,6 +56,7 @@ class UiTk(Ui):
             
         Overrides the superclass method.       
         """
+        from tkinter import messagebox
         return messagebox.askyesno(_("WARNING"), text)
 
     def set_info_how(self, message):
@@ -100,6 +102,7 @@ class UiTk(Ui):
 
     def show_warning(self, message):
         """Display a warning message box."""
+        from tkinter import messagebox
         messagebox.showwarning(self.title, message)
 
     def start(self):
@@ -5,23 +5,71 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 
+_indents = ['\n']
+# Line break and indentation by level.
+
+
+def _get_indent(level):
+    """Return a line break followed by the indentation for a level."""
+    while len(_indents) <= level:
+        _indents.append(f'{_indents[-1]}  ')
+    return _indents[level]
+
 
 def indent(elem, level=0):
     """xml pretty printer
 
     Kudos to to Fredrik Lundh. 
     Source: http://effbot.org/zone/element-lib.htm#prettyprint
+    
+    Iterative version with cached indentation strings.
+    Whitespace-only text and tails are replaced; other text is kept.
     """
-    i = f'\n{level * "  "}'
     if len(elem):
-        if not elem.text or not elem.text.strip():
-            elem.text = f'{i}  '
-        if not elem.tail or not elem.tail.strip():
-            elem.tail = i
-        for elem in elem:
-            indent(elem, level + 1)
-        if not elem.tail or not elem.tail.strip():
-            elem.tail = i
-    else:
-        if level and (not elem.tail or not elem.tail.strip()):
-            elem.tail = i
+        if not elem.tail or elem.tail.isspace():
+            elem.tail = _get_indent(level)
+    elif level and (not elem.tail or elem.tail.isspace()):
+        elem.tail = _get_indent(level)
+    stack = [(elem, level)]
+    while stack:
+        elem, level = stack.pop()
+        if not len(elem):
+            continue
+
+        if not elem.text or elem.text.isspace():
+            elem.text = _get_indent(level + 1)
+        childIndent = _get_indent(level + 1)
+        for child in elem:
+            if not child.tail or child.tail.isspace():
+                child.tail = childIndent
+            if len(child):
+                stack.append((child, level + 1))
+        if not child.tail or child.tail.isspace():
+            child.tail = _get_indent(level)
+
+
+def indent_appended(parent, children, level=0):
+    """Indent the elements appended to an indented parent element.
+    
+    Positional arguments:
+        parent -- element the children have been appended to.
+        children -- list of the appended child elements; they must be the parent's last ones.
+    
+    Optional arguments:
+        level: int -- the parent element's level.
+    """
+    if not children:
+        return
+
+    childIndent = _get_indent(level + 1)
+    previousIndex = len(parent) - len(children) - 1
+    if previousIndex >= 0:
+        previous = parent[previousIndex]
+        if not previous.tail or previous.tail.isspace():
+            previous.tail = childIndent
+    elif not parent.text or parent.text.isspace():
+        parent.text = childIndent
+    for child in children:
+        indent(child, level + 1)
+    if not children[-1].tail or children[-1].tail.isspace():
+        children[-1].tail = _get_indent(level)
@@ -8,6 +8,10 @@ For further information see https://github.com/peter88213/yw-timeline
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
+import sys
+import glob
+import json
+import time
 import argparse
 from pathlib import Path
 from pywriter.pywriter_globals import *
@@ -15,6 +19,9 @@ from pywriter.ui.ui import Ui
 from pywriter.ui.ui_tk import UiTk
 from pywriter.ui.set_icon_tk import *
 from pywriter.config.configuration import Configuration
+from pywriter.converter.phase_recorder import PhaseRecorder
+from pywriter.yw.yw7_file import Yw7File
+from ywtimelinelib.tl_file import TlFile
 from ywtimelinelib.tl_converter import TlConverter
 
 SUFFIX = ''
@@ -23,22 +30,27 @@ SETTINGS = dict(
     scene_label='Scene',
     default_date_time='2021-07-26 00:00:00',
     scene_color='170,240,160',
+    cache_dir='',
+    cache_size='100',
+    backup_count='10',
 )
 OPTIONS = dict(
     ignore_unspecific=False,
     dhm_to_datetime=False,
     datetime_to_dhm=False,
+    incremental_sync=False,
+    patch_timeline=False,
+    project_cache=False,
+    indent_xml=True,
+    single_backup=True,
 )
 
 
-def run(sourcePath, silentMode=True, installDir='.'):
-    if silentMode:
-        ui = Ui('')
-    else:
-        ui = UiTk(f'{_("Synchronize Timeline and yWriter")} @release')
-        set_icon(ui.root, icon='tLogo32')
-
-    #--- Try to get persistent configuration data
+def get_configuration(sourcePath, installDir='.'):
+    """Return the keyword arguments for the converter.
+    
+    The global configuration is overridden by the project's configuration, if any.
+    """
     sourceDir = os.path.dirname(sourcePath)
     if not sourceDir:
         sourceDir = '.'
@@ -50,26 +62,188 @@ def run(sourcePath, silentMode=True, installDir='.'):
     kwargs = {'suffix': SUFFIX}
     kwargs.update(configuration.settings)
     kwargs.update(configuration.options)
+    return kwargs
+
+
+def run(sourcePath, silentMode=True, installDir='.', recorder=None):
+    if silentMode:
+        ui = Ui('')
+    else:
+        ui = UiTk(f'{_("Synchronize Timeline and yWriter")} @release')
+        set_icon(ui.root, icon='tLogo32')
+
+    #--- Try to get persistent configuration data
+    kwargs = get_configuration(sourcePath, installDir)
     converter = TlConverter()
     converter.ui = ui
+    converter.recorder = recorder
     converter.run(sourcePath, **kwargs)
     ui.start()
 
 
+def expand_paths(patterns):
+    """Return a list of source paths.
+    
+    Positional arguments:
+        patterns: list of file paths, directories, or glob patterns.
+        
+    A directory stands for the yWriter projects it contains.
+    Patterns not matching anything are passed through, so they are reported as missing.
+    """
+    sourcePaths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            sourcePaths.extend(sorted(glob.glob(os.path.join(glob.escape(pattern), f'*{Yw7File.EXTENSION}'))))
+        elif glob.has_magic(pattern):
+            sourcePaths.extend(sorted(glob.glob(pattern)))
+        else:
+            sourcePaths.append(pattern)
+    return sourcePaths
+
+
+def sync_file(sourcePath, installDir='.', profile=False):
+    """Synchronize a project in silent mode and return a summary dictionary.
+    
+    Positional arguments:
+        sourcePath: str -- the path of the yWriter/Timeline project file.
+    
+    Optional arguments:
+        installDir: str -- the global configuration directory.
+        profile: bool -- if True, add the measured conversion phases to the summary.
+        
+    The summary comprises the source path, status, message, duration in seconds, 
+    the number of bytes read from the project files, and the size of the project files written.
+    """
+    fileName, __ = os.path.splitext(sourcePath)
+    projectFiles = [f'{fileName}{Yw7File.EXTENSION}', f'{fileName}{TlFile.EXTENSION}']
+
+    def get_file_ids():
+        fileIds = {}
+        for filePath in projectFiles:
+            try:
+                status = os.stat(filePath)
+            except OSError:
+                continue
+
+            fileIds[filePath] = (status.st_size, status.st_mtime_ns)
+        return fileIds
+
+    startTime = time.perf_counter()
+    fileIdsBefore = get_file_ids()
+    ui = Ui('')
+    if profile:
+        recorder = PhaseRecorder()
+    else:
+        recorder = None
+    bytesRead = 0
+    try:
+        kwargs = get_configuration(sourcePath, installDir)
+        converter = TlConverter()
+        converter.ui = ui
+        converter.recorder = recorder
+        converter.run(sourcePath, **kwargs)
+        bytesRead = converter.bytesRead
+        message = ui.infoHowText
+        if converter.newFile is None:
+            status = 'failed'
+        else:
+            status = 'ok'
+    except Exception as ex:
+        message = str(ex)
+        status = 'failed'
+    fileIdsAfter = get_file_ids()
+    bytesWritten = 0
+    for filePath in fileIdsAfter:
+        if fileIdsAfter[filePath] != fileIdsBefore.get(filePath):
+            bytesWritten += fileIdsAfter[filePath][0]
+    summary = dict(
+        sourcePath=sourcePath,
+        status=status,
+        message=message,
+        seconds=round(time.perf_counter() - startTime, 3),
+        bytesRead=bytesRead,
+        bytesWritten=bytesWritten,
+        )
+    if recorder is not None:
+        summary['phases'] = recorder.records
+    return summary
+
+
+def run_batch(sourcePaths, installDir='.', workers=None, profile=False):
+    """Synchronize several projects in parallel and return a summary dictionary.
+    
+    Positional arguments:
+        sourcePaths: list of yWriter/Timeline project file paths.
+        
+    Optional arguments:
+        installDir: str -- the global configuration directory.
+        workers: int -- maximum number of worker processes. Default: number of processors.
+        profile: bool -- if True, add the measured conversion phases to the summary.
+        
+    Each project is synchronized in silent mode, applying its own configuration file, if any.
+    The process pool is only imported when needed, because it takes long to load.
+    """
+    startTime = time.perf_counter()
+    if workers == 1 or len(sourcePaths) < 2:
+        results = [sync_file(sourcePath, installDir, profile) for sourcePath in sourcePaths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(sync_file, sourcePaths, [installDir] * len(sourcePaths),
+                                        [profile] * len(sourcePaths)))
+    return dict(
+        files=results,
+        failed=len([result for result in results if result['status'] != 'ok']),
+        seconds=round(time.perf_counter() - startTime, 3),
+        )
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
         description='Synchronize yWriter with Timeline',
         epilog='')
     parser.add_argument('sourcePath',
                         metavar='Sourcefile',
-                        help='The path of the yWriter/Timeline project file.')
+                        nargs='+',
+                        help='The path of the yWriter/Timeline project file. '
+                        'Batch mode: several paths, directories, or glob patterns.')
     parser.add_argument('--silent',
                         action="store_true",
                         help='suppress error messages and the request to confirm overwriting')
+    parser.add_argument('--workers',
+                        type=int,
+                        help='batch mode: maximum number of worker processes')
+    parser.add_argument('--profile',
+                        action="store_true",
+                        help='measure time and memory per conversion phase and print a table')
+    parser.add_argument('--profile-json',
+                        metavar='FILE',
+                        help='measure time and memory per conversion phase and write them to a JSON file')
     args = parser.parse_args()
     try:
         homeDir = str(Path.home()).replace('\\', '/')
         installDir = f'{homeDir}/.pywriter/{APPNAME}/config'
     except:
         installDir = '.'
-    run(args.sourcePath, args.silent, installDir)
+    sourcePaths = expand_paths(args.sourcePath)
+    profile = args.profile or args.profile_json is not None
+    if len(args.sourcePath) == 1 and sourcePaths == args.sourcePath and args.workers is None:
+        if profile:
+            recorder = PhaseRecorder()
+        else:
+            recorder = None
+        run(args.sourcePath[0], args.silent, installDir, recorder)
+        if args.profile:
+            print(recorder.get_table())
+        if args.profile_json:
+            with open(args.profile_json, 'w', encoding='utf-8') as f:
+                f.write(recorder.get_json())
+    else:
+        # Batch mode: Synchronize in silent mode and print a JSON summary.
+        summary = run_batch(sourcePaths, installDir, args.workers, profile)
+        print(json.dumps(summary, indent=2))
+        if args.profile_json:
+            with open(args.profile_json, 'w', encoding='utf-8') as f:
+                json.dump({result['sourcePath']: result['phases'] for result in summary['files']}, f, indent=2)
+        if summary['failed']:
+            sys.exit(1)
@@ -26,3 +26,20 @@ def fix_iso_dt(tlDateTime):
     if isBc:
         tlDateTime = f'-{tlDateTime}'
     return tlDateTime
+
+
+def get_dt_key(isoDateTime):
+    """Return a sort key for a date/time string.
+    
+    Positional arguments:
+        isoDateTime - date/time string as returned by fix_iso_dt().
+    
+    The key is a tuple of the year as an integer and the rest of the string, 
+    so "BC" dates and years with more than four figures are ordered correctly.
+    """
+    if isoDateTime.startswith('-'):
+        year, rest = isoDateTime[1:].split('-', 1)
+        return -int(year), rest
+
+    year, rest = isoDateTime.split('-', 1)
+    return int(year), rest
@@ -0,0 +1,103 @@
+"""Provide a class for parsing the scene references in Timeline event labels.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+
+SCENE_ID = re.compile(r'ScID\:([0-9]+)')
+# Label referencing a yWriter scene.
+
+
+class LabelParser:
+    """Parser for the scene references in Timeline event labels.
+
+    Public methods:
+        get_scene_id(labels) -- return the ID of the scene referenced in the labels.
+        get_scene_marker(labels) -- return the label text marking an event as a scene.
+
+    The patterns are compiled once, and the results are cached per labels string,
+    because most events share a few label sets.
+    """
+    _CACHE_SIZE = 10000
+    # Maximum number of cached labels strings; the cache is emptied when exceeded.
+
+    def __init__(self, sceneMarker):
+        """Compile the patterns.
+
+        Positional arguments:
+            sceneMarker: str -- regular expression matching the labels of scene events to be imported.
+
+        The scene reference and the scene marker are searched in a single scan.
+        If the scene marker can not be combined with the scene reference pattern,
+        e.g. because it has groups of its own, they are searched one after the other.
+        """
+        self._sceneMarker = sceneMarker
+        self._sceneIds = {}
+        # key: labels, value: scene ID or None.
+        self._sceneMarkers = {}
+        # key: labels, value: scene marker or None.
+        try:
+            marker = re.compile(sceneMarker)
+            if marker.groups or marker.flags & ~re.UNICODE:
+                raise re.error('The scene marker has groups or flags.')
+
+            self._markerPattern = re.compile(rf'(?s:.*?)ScID\:(?P<scId>[0-9]+)|(?s:.*?)(?P<marker>{sceneMarker})')
+        except re.error:
+            self._markerPattern = None
+
+    def get_scene_id(self, labels):
+        """Return the ID of the scene referenced in the labels, or None.
+
+        Positional arguments:
+            labels: str -- text of an event's labels element.
+        """
+        try:
+            return self._sceneIds[labels]
+
+        except KeyError:
+            pass
+        sceneMatch = SCENE_ID.search(labels)
+        if sceneMatch is None:
+            scId = None
+        else:
+            scId = sceneMatch.group(1)
+        if len(self._sceneIds) >= self._CACHE_SIZE:
+            self._sceneIds.clear()
+        self._sceneIds[labels] = scId
+        return scId
+
+    def get_scene_marker(self, labels):
+        """Return the label text marking an event as a scene, or None.
+
+        Positional arguments:
+            labels: str -- text of an event's labels element.
+
+        This is the scene reference, if any. Otherwise, it is the text matching the scene marker.
+        """
+        try:
+            return self._sceneMarkers[labels]
+
+        except KeyError:
+            pass
+        if self._markerPattern is None:
+            sceneMatch = SCENE_ID.search(labels)
+            if sceneMatch is None:
+                sceneMatch = re.search(self._sceneMarker, labels)
+            if sceneMatch is None:
+                sceneMarker = None
+            else:
+                sceneMarker = sceneMatch.group()
+        else:
+            sceneMatch = self._markerPattern.match(labels)
+            if sceneMatch is None:
+                sceneMarker = None
+            elif sceneMatch.group('scId') is not None:
+                sceneMarker = f'ScID:{sceneMatch.group("scId")}'
+            else:
+                sceneMarker = sceneMatch.group('marker')
+        if len(self._sceneMarkers) >= self._CACHE_SIZE:
+            self._sceneMarkers.clear()
+        self._sceneMarkers[labels] = sceneMarker
+        return sceneMarker
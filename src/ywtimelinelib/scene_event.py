@@ -4,12 +4,21 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/yw-timeline
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+import re
 import xml.etree.ElementTree as ET
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
+from pywriter.pywriter_globals import *
 from pywriter.model.scene import Scene
 
+np = lazy_import('numpy')
+# Executed on the first batch conversion, because importing NumPy takes longer than starting the application.
+# If NumPy is not installed, the date/time batches are converted scene by scene.
+
+ISO_DATE_TIME = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2} (?:[01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9]\Z')
+# Date/time strings that can be converted the same way by NumPy and datetime.
+
 
 class SceneEvent(Scene):
     """Timeline scene event representation.
@@ -17,7 +26,10 @@ class SceneEvent(Scene):
     Public methods:
         set_date_time(startDateTime, endDateTime, isUnspecific) -- set date/time and, if applicable, duration.
         merge_date_time(source) -- get date/time related variables from a yWriter-generated source scene.
+        set_date_times(items) -- set date/time and duration of several events (class method).
+        merge_date_times(items) -- merge date/time of several events (class method).
         build_subtree(xmlEvent, scId, dtMin, dtMax) -- build a Timeline XML event subtree. 
+        get_period() -- return the event's start and end date/time.
 
     Public instance variables:
         contId: str -- container ID.
@@ -25,6 +37,9 @@ class SceneEvent(Scene):
     defaultDateTime = '2021-07-26 00:00:00'
     sceneColor = '170,240,160'
 
+    _MAX_SECONDS = 10000 * 366 * 24 * 3600
+    # Durations beyond this are left to the scalar path, which raises an OverflowError.
+
     def __init__(self):
         """Initialize instance variables.     
         
@@ -152,6 +167,184 @@ class SceneEvent(Scene):
         if self._startDateTime > self._endDateTime:
             self._endDateTime = self._startDateTime
 
+    @classmethod
+    def set_date_times(cls, items):
+        """Set date/time and, if applicable, duration of several events.
+        
+        Positional arguments:
+            items -- list of (event, startDateTime, endDateTime, isUnspecific) tuples.
+        
+        This is equivalent to calling set_date_time() for each event.
+        If NumPy is installed, the date/times yWriter can process are converted 
+        as a whole; "BC" and two-figure years take the scalar path.
+        """
+        if np is None:
+            for event, startDateTime, endDateTime, isUnspecific in items:
+                event.set_date_time(startDateTime, endDateTime, isUnspecific)
+            return
+
+        batch = []
+        for item in items:
+            event, startDateTime, endDateTime, isUnspecific = item
+            if startDateTime >= '0100' and ISO_DATE_TIME.match(startDateTime) and ISO_DATE_TIME.match(endDateTime):
+                batch.append(item)
+            else:
+                event.set_date_time(startDateTime, endDateTime, isUnspecific)
+        if not batch:
+            return
+
+        try:
+            starts = np.array([item[1] for item in batch], dtype='datetime64[s]')
+            ends = np.array([item[2] for item in batch], dtype='datetime64[s]')
+        except ValueError:
+            # Let the scalar path raise the exception.
+            for event, startDateTime, endDateTime, isUnspecific in batch:
+                event.set_date_time(startDateTime, endDateTime, isUnspecific)
+            return
+
+        seconds = (ends - starts).astype(np.int64)
+        lastsDays = (seconds // (24 * 3600)).tolist()
+        lastsHours = (seconds % (24 * 3600) // 3600).tolist()
+        lastsMinutes = (seconds % 3600 // 60).tolist()
+        try:
+            referenceDate = np.datetime64(date.fromisoformat(cls.defaultDateTime.split(' ')[0]), 'D')
+            days = (starts.astype('datetime64[D]') - referenceDate).astype(np.int64).tolist()
+        except:
+            # Do not synchronize.
+            days = None
+        for i, (event, startDateTime, endDateTime, isUnspecific) in enumerate(batch):
+            event._startDateTime = startDateTime
+            event._endDateTime = endDateTime
+            event.time = startDateTime[11:]
+            event.lastsDays = str(lastsDays[i])
+            event.lastsHours = str(lastsHours[i])
+            event.lastsMinutes = str(lastsMinutes[i])
+            if isUnspecific:
+                # Convert date to day
+                if days is None:
+                    event.day = None
+                else:
+                    event.day = str(days[i])
+                event.date = None
+            else:
+                event.date = startDateTime[:10]
+
+    @classmethod
+    def merge_date_times(cls, items):
+        """Set date/time related variables of several events from yWriter-generated source scenes.
+        
+        Positional arguments:
+            items -- list of (event, source) tuples.
+        
+        This is equivalent to calling merge_date_time() for each event.
+        If NumPy is installed, the start and end date/times are calculated as a whole; 
+        scenes with two-figure years or invalid values take the scalar path.
+        """
+        if np is None:
+            for event, source in items:
+                event.merge_date_time(source)
+            return
+
+        # The batch is held in parallel lists, which is faster than a list of tuples.
+        events = []
+        sources = []
+        startDateTimes = []
+        durations = []
+        dayEvents = []
+        daySources = []
+        days = []
+        dayDurations = []
+        # The same for scenes with unspecific date.
+        for event, source in items:
+            if source.date == Scene.NULL_DATE:
+                event.merge_date_time(source)
+                continue
+
+            try:
+                lastsSeconds = (int(source.lastsDays or 0) * 24 * 3600
+                                +int(source.lastsHours or 0) * 3600
+                                +int(source.lastsMinutes or 0) * 60)
+                if source.date is None:
+                    day = int(source.day or 0)
+                else:
+                    day = 0
+            except ValueError:
+                event.merge_date_time(source)
+                continue
+
+            if abs(lastsSeconds) > cls._MAX_SECONDS or abs(day) * 24 * 3600 > cls._MAX_SECONDS:
+                event.merge_date_time(source)
+            elif source.date is None:
+                dayEvents.append(event)
+                daySources.append(source)
+                days.append(day)
+                dayDurations.append(lastsSeconds)
+            else:
+                startDateTime = f'{source.date} {source.time or "00:00:00"}'
+                if ISO_DATE_TIME.match(startDateTime):
+                    events.append(event)
+                    sources.append(source)
+                    startDateTimes.append(startDateTime)
+                    durations.append(lastsSeconds)
+                else:
+                    event.merge_date_time(source)
+
+        #--- Calculate the start dates from the days.
+        if dayEvents:
+            try:
+                referenceDate = np.datetime64(date.fromisoformat(cls.defaultDateTime.split(' ')[0]), 'D')
+            except ValueError:
+                # Let the scalar path raise the exception.
+                referenceDate = None
+            if referenceDate is None:
+                startDates = None
+            else:
+                startDates = referenceDate + np.array(days, dtype='timedelta64[D]')
+                isValid = ((startDates >= np.datetime64('0001-01-01'))
+                           & (startDates <= np.datetime64('9999-12-31'))).tolist()
+                startDates = np.datetime_as_string(startDates).tolist()
+            for i, event in enumerate(dayEvents):
+                if startDates is not None and isValid[i]:
+                    startDateTime = f'{startDates[i]} {daySources[i].time or "00:00:00"}'
+                    if ISO_DATE_TIME.match(startDateTime):
+                        events.append(event)
+                        sources.append(daySources[i])
+                        startDateTimes.append(startDateTime)
+                        durations.append(dayDurations[i])
+                        continue
+
+                event.merge_date_time(daySources[i])
+        if not events:
+            return
+
+        #--- Calculate the end dates from the durations.
+        try:
+            starts = np.array(startDateTimes, dtype='datetime64[s]')
+        except ValueError:
+            # Let the scalar path raise the exception.
+            for event, source in zip(events, sources):
+                event.merge_date_time(source)
+            return
+
+        ends = starts + np.array(durations, dtype='timedelta64[s]')
+        isValid = ((ends >= np.datetime64('0001-01-01T00:00:00'))
+                   & (ends <= np.datetime64('9999-12-31T23:59:59'))).tolist()
+        # Tribute to defensive programming.
+        endDateTimes = np.char.replace(np.datetime_as_string(np.maximum(starts, ends)), 'T', ' ').tolist()
+        for i, event in enumerate(events):
+            if isValid[i]:
+                event._startDateTime = startDateTimes[i]
+                event._endDateTime = endDateTimes[i]
+            else:
+                event.merge_date_time(sources[i])
+
+    def get_period(self):
+        """Return a tuple of the event's start and end date/time, or None if not set."""
+        if self._startDateTime is None or self._endDateTime is None:
+            return None
+
+        return self._startDateTime, self._endDateTime
+
     def build_subtree(self, xmlEvent, scId, dtMin, dtMax):
         """Build a Timeline XML event subtree.
         
@@ -166,63 +359,83 @@ class SceneEvent(Scene):
             dtMax: str -- updated upper date/time limit.
         
         xmlEvent elements are created or updated.
+        Missing elements are inserted in the order Timeline writes them.
         """
-        scIndex = 0
-        try:
-            xmlEvent.find('start').text = self._startDateTime
-        except(AttributeError):
-            ET.SubElement(xmlEvent, 'start').text = self._startDateTime
         if (not dtMin) or (self._startDateTime < dtMin):
             dtMin = self._startDateTime
-        scIndex += 1
-        try:
-            xmlEvent.find('end').text = self._endDateTime
-        except(AttributeError):
-            ET.SubElement(xmlEvent, 'end').text = self._endDateTime
         if (not dtMax) or (self._endDateTime > dtMax):
             dtMax = self._endDateTime
-        scIndex += 1
         if not self.title:
             self.title = f'Unnamed scene ID{scId}'
-        try:
-            xmlEvent.find('text').text = self.title
-        except(AttributeError):
-            ET.SubElement(xmlEvent, 'text').text = self.title
-        scIndex += 1
-        if xmlEvent.find('progress') is None:
-            ET.SubElement(xmlEvent, 'progress').text = '0'
-        scIndex += 1
-        if xmlEvent.find('fuzzy') is None:
-            ET.SubElement(xmlEvent, 'fuzzy').text = 'False'
-        scIndex += 1
-        if xmlEvent.find('fuzzy_start') is not None:
-            scIndex += 1
-        if xmlEvent.find('fuzzy_end') is not None:
-            scIndex += 1
-        if xmlEvent.find('locked') is None:
-            ET.SubElement(xmlEvent, 'locked').text = 'False'
-        scIndex += 1
-        if xmlEvent.find('ends_today') is None:
-            ET.SubElement(xmlEvent, 'ends_today').text = 'False'
-        scIndex += 1
+
+        # Each element is looked up once; Element.find() is faster than indexing the children in Python.
+        xmlStart = xmlEvent.find('start')
+        xmlEnd = xmlEvent.find('end')
+        xmlText = xmlEvent.find('text')
+        xmlDescription = xmlEvent.find('description')
+        if (xmlStart is None or xmlEnd is None or xmlText is None
+                or (xmlDescription is None and self.desc is not None)
+                or xmlEvent.find('progress') is None
+                or xmlEvent.find('fuzzy') is None
+                or xmlEvent.find('locked') is None
+                or xmlEvent.find('ends_today') is None
+                or xmlEvent.find('labels') is None
+                or xmlEvent.find('default_color') is None):
+            self._complete_subtree(xmlEvent, scId)
+            return dtMin, dtMax
+
+        xmlStart.text = self._startDateTime
+        xmlEnd.text = self._endDateTime
+        xmlText.text = self.title
         if self.desc is not None:
-            try:
-                xmlEvent.find('description').text = self.desc
-            except(AttributeError):
-                if xmlEvent.find('labels') is None:
-                    # Append the description.
-                    ET.SubElement(xmlEvent, 'description').text = self.desc
-                else:
-                    # Insert the description.
-                    if xmlEvent.find('category') is not None:
-                        scIndex += 1
-                    desc = ET.Element('description')
-                    desc.text = self.desc
-                    xmlEvent.insert(scIndex, desc)
-        elif xmlEvent.find('description') is not None:
-            xmlEvent.remove(xmlEvent.find('description'))
-        if xmlEvent.find('labels') is None:
-            ET.SubElement(xmlEvent, 'labels').text = f'ScID:{scId}'
-        if xmlEvent.find('default_color') is None:
-            ET.SubElement(xmlEvent, 'default_color').text = self.sceneColor
+            xmlDescription.text = self.desc
+        elif xmlDescription is not None:
+            xmlEvent.remove(xmlDescription)
         return dtMin, dtMax
+
+    def _complete_subtree(self, xmlEvent, scId):
+        """Update the event's child elements, inserting the missing ones in Timeline's order.
+        
+        Positional arguments:
+            xmlEvent: elementTree.SubElement -- Timeline event XML subtree.
+            scId: str -- scene ID.
+        """
+        children = list(xmlEvent)
+        indices = {}
+        # key: tag, value: index of the first child element, like found by xmlEvent.find().
+        for i in range(len(children) - 1, -1, -1):
+            indices[children[i].tag] = i
+        position = 0
+        # Where to insert the next missing element: after the last of its predecessors present.
+        # The existing elements may be in any order, so their current index is looked up.
+        hasDescription = self.desc is not None
+        for tag, text, isUpdated, isCreated in (
+                ('start', self._startDateTime, True, True),
+                ('end', self._endDateTime, True, True),
+                ('text', self.title, True, True),
+                ('progress', '0', False, True),
+                ('fuzzy', 'False', False, True),
+                ('fuzzy_start', None, False, False),
+                ('fuzzy_end', None, False, False),
+                ('locked', 'False', False, True),
+                ('ends_today', 'False', False, True),
+                ('category', None, False, False),
+                ('description', self.desc, hasDescription, hasDescription),
+                ('labels', f'ScID:{scId}', False, True),
+                ('default_color', self.sceneColor, False, True),
+                ):
+            i = indices.get(tag)
+            if i is None:
+                if isCreated:
+                    element = ET.Element(tag)
+                    element.text = text
+                    xmlEvent.insert(position, element)
+                    position += 1
+            elif tag == 'description' and not hasDescription:
+                if list(xmlEvent).index(children[i]) < position:
+                    position -= 1
+                xmlEvent.remove(children[i])
+            else:
+                if isUpdated:
+                    children[i].text = text
+                position = max(position, list(xmlEvent).index(children[i]) + 1)
@@ -0,0 +1,145 @@
+"""Provide a class for an interval index over scene event date/times.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from ywtimelinelib.dt_helper import fix_iso_dt
+from ywtimelinelib.dt_helper import get_dt_key
+
+
+class SceneIndex:
+    """Interval index over the date/time periods of scene events.
+
+    Public methods:
+        get_overlapping(startDateTime, endDateTime) -- return the IDs of the scenes overlapping a period.
+        get_concurrent(scId) -- return the IDs of the other scenes overlapping a scene's period.
+
+    The periods include their start and end, so scenes that just touch each other overlap.
+
+    The index is an implicit interval tree: The periods are sorted by start,
+    and a binary tree is laid over the sorted list, each node storing
+    the maximum end of its subtree. A query only visits the subtrees
+    that can hold overlapping periods, so it takes O(log n + k) time
+    for k results, instead of scanning all n scenes.
+    """
+    _SCAN_LEVEL = 3
+    # Subtrees up to this level are scanned linearly.
+
+    def __init__(self, periods):
+        """Build the index.
+
+        Positional arguments:
+            periods -- iterable of (scene ID, start date/time, end date/time) tuples.
+        """
+        entries = []
+        for scId, startDateTime, endDateTime in periods:
+            entries.append((get_dt_key(fix_iso_dt(startDateTime)), get_dt_key(fix_iso_dt(endDateTime)), scId))
+        entries.sort(key=lambda entry: entry[0])
+        self._starts = [entry[0] for entry in entries]
+        self._ends = [entry[1] for entry in entries]
+        self._scIds = [entry[2] for entry in entries]
+        self._periods = {}
+        # key: scene ID, value: tuple of start and end key.
+        for start, end, scId in entries:
+            self._periods[scId] = (start, end)
+        self._maxEnds = list(self._ends)
+        # Maximum end of the subtree, by node index.
+        self._maxLevel = self._build_tree()
+
+    def __len__(self):
+        return len(self._scIds)
+
+    def get_overlapping(self, startDateTime, endDateTime):
+        """Return a list of the IDs of the scenes overlapping a period, sorted by start date/time.
+
+        Positional arguments:
+            startDateTime: str -- start of the period.
+            endDateTime: str -- end of the period.
+        """
+        start = get_dt_key(fix_iso_dt(startDateTime))
+        end = get_dt_key(fix_iso_dt(endDateTime))
+        return [self._scIds[i] for i in self._query(start, end)]
+
+    def get_concurrent(self, scId):
+        """Return a list of the IDs of the other scenes overlapping a scene's period, sorted by start date/time.
+
+        Positional arguments:
+            scId: str -- scene ID.
+
+        If the scene is not indexed, return an empty list.
+        """
+        try:
+            start, end = self._periods[scId]
+        except KeyError:
+            return []
+
+        return [self._scIds[i] for i in self._query(start, end) if self._scIds[i] != scId]
+
+    def _build_tree(self):
+        """Compute the subtrees' maximum ends and return the root's level.
+
+        A node's level is the number of trailing 1 bits of its index.
+        Nodes on level k have children at index +/- 2**(k-1).
+        """
+        n = len(self._ends)
+        if not n:
+            return -1
+
+        ends = self._ends
+        maxEnds = self._maxEnds
+        lastIndex = (n - 1) & ~1
+        lastEnd = maxEnds[lastIndex]
+        # Maximum end of the rightmost subtree on the current level.
+        k = 1
+        while 1 << k <= n:
+            x = 1 << (k - 1)
+            for i in range((x << 1) - 1, n, x << 2):
+                if i + x < n:
+                    rightEnd = maxEnds[i + x]
+                else:
+                    rightEnd = lastEnd
+                maxEnds[i] = max(ends[i], maxEnds[i - x], rightEnd)
+            if (lastIndex >> k) & 1:
+                lastIndex -= x
+            else:
+                lastIndex += x
+            if lastIndex < n and maxEnds[lastIndex] > lastEnd:
+                lastEnd = maxEnds[lastIndex]
+            k += 1
+        return k - 1
+
+    def _query(self, start, end):
+        """Return a list of the indices of the periods overlapping (start, end), in ascending order."""
+        n = len(self._starts)
+        result = []
+        if not n:
+            return result
+
+        starts = self._starts
+        ends = self._ends
+        maxEnds = self._maxEnds
+        stack = [((1 << self._maxLevel) - 1, self._maxLevel, False)]
+        while stack:
+            x, k, isLeftDone = stack.pop()
+            if k <= self._SCAN_LEVEL:
+                # Scan the small subtree.
+                i0 = x >> k << k
+                for i in range(i0, min(i0 + (1 << (k + 1)) - 1, n)):
+                    if starts[i] > end:
+                        break
+
+                    if ends[i] >= start:
+                        result.append(i)
+            elif not isLeftDone:
+                # Visit the left subtree first, if it may overlap.
+                y = x - (1 << (k - 1))
+                stack.append((x, k, True))
+                if y >= n or maxEnds[y] >= start:
+                    stack.append((y, k - 1, False))
+            elif x < n and starts[x] <= end:
+                # The right subtree's periods start after this node.
+                if ends[x] >= start:
+                    result.append(x)
+                stack.append((x + (1 << (k - 1)), k - 1, False))
+        return result
@@ -0,0 +1,154 @@
+"""Provide a class for the synchronization journal.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import json
+from hashlib import sha1
+from pywriter.pywriter_globals import *
+from pywriter.file.atomic_write import atomic_write
+
+
+class SyncJournal:
+    """Sidecar file with the state of the last successful synchronization.
+
+    Public methods:
+        has_changes(source, target) -- check whether the target file needs to be written.
+        is_up_to_date(source, target) -- check whether both files are unchanged since the last synchronization.
+        update(source, target) -- record the state after a successful synchronization.
+
+    Public instance variables:
+        filePath: str -- path to the journal file.
+
+    The journal stores a fingerprint of each scene's synchronized metadata
+    (title, description, start, duration, and type), the size and modification
+    time of both files, the conversion direction, and the settings.
+    """
+    EXTENSION = '.tlsync'
+    SCENE_FIELDS = (
+        'title',
+        'desc',
+        'date',
+        'time',
+        'day',
+        'lastsDays',
+        'lastsHours',
+        'lastsMinutes',
+        'scType',
+        )
+    # Scene instance variables that are synchronized with the timeline.
+
+    def __init__(self, filePath, settings):
+        """Read the journal file, if any.
+
+        Positional arguments:
+            filePath: str -- path to the journal file.
+            settings: dict -- conversion settings and options.
+
+        A journal recorded with different settings is disregarded.
+        """
+        self.filePath = filePath
+        self._settings = sha1(json.dumps(settings, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        self._state = {}
+        try:
+            with open(self.filePath, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('settings') == self._settings:
+                self._state = state
+        except:
+            pass
+
+    def has_changes(self, source, target):
+        """Return True if the target file needs to be written.
+
+        Positional arguments:
+            source -- File instance, already read.
+            target -- File instance to be written.
+
+        The target is written if it has changed, or if any scene was added,
+        modified, or removed since the last synchronization.
+        """
+        if not self._is_same_conversion(source, target):
+            return True
+
+        if self._get_file_id(target.filePath) != self._state['files'].get('target'):
+            return True
+
+        return self._get_fingerprints(source.novel) != self._state.get('scenes', {})
+
+    def is_up_to_date(self, source, target):
+        """Return True if neither file has changed since the last synchronization.
+
+        Positional arguments:
+            source -- File instance.
+            target -- File instance.
+        """
+        if not self._is_same_conversion(source, target):
+            return False
+
+        if self._get_file_id(source.filePath) != self._state['files'].get('source'):
+            return False
+
+        if self._get_file_id(target.filePath) != self._state['files'].get('target'):
+            return False
+
+        return True
+
+    def update(self, source, target):
+        """Record the state after a successful synchronization and write the journal file.
+
+        Positional arguments:
+            source -- File instance, already read.
+            target -- File instance, already written.
+
+        Raise the "Error" exception in case of error.
+        """
+        self._state = dict(
+            settings=self._settings,
+            source=os.path.basename(source.filePath),
+            target=os.path.basename(target.filePath),
+            files=dict(
+                source=self._get_file_id(source.filePath),
+                target=self._get_file_id(target.filePath),
+                ),
+            scenes=self._get_fingerprints(source.novel),
+            )
+        try:
+            with atomic_write(self.filePath) as tempPath:
+                with open(tempPath, 'w', encoding='utf-8') as f:
+                    json.dump(self._state, f)
+        except:
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+
+    def _get_file_id(self, filePath):
+        """Return a list of size and modification time of a file, or None if not existing."""
+        try:
+            status = os.stat(filePath)
+        except OSError:
+            return None
+
+        return [status.st_size, status.st_mtime_ns]
+
+    def _get_fingerprints(self, novel):
+        """Return a dictionary of the scenes' metadata fingerprints."""
+        fingerprints = {}
+        for scId in novel.scenes:
+            scene = novel.scenes[scId]
+            metadata = json.dumps([getattr(scene, field) for field in self.SCENE_FIELDS])
+            fingerprints[scId] = sha1(metadata.encode('utf-8')).hexdigest()
+        return fingerprints
+
+    def _is_same_conversion(self, source, target):
+        """Return True if the last synchronization had the same source and target."""
+        if not self._state:
+            return False
+
+        if self._state.get('source') != os.path.basename(source.filePath):
+            return False
+
+        if self._state.get('target') != os.path.basename(target.filePath):
+            return False
+
+        return True
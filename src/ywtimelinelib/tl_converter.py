@@ -10,6 +10,7 @@ from pywriter.converter.yw_cnv_ui import YwCnvUi
 from pywriter.yw.yw7_file import Yw7File
 from pywriter.model.novel import Novel
 from ywtimelinelib.tl_file import TlFile
+from ywtimelinelib.sync_journal import SyncJournal
 
 
 class TlConverter(YwCnvUi):
@@ -27,17 +28,25 @@ class TlConverter(YwCnvUi):
 
         The direction of the conversion is determined by the source file type.
         Only yWriter project files and Timeline files are accepted.
+        If the "incremental_sync" option is set, unchanged targets are not rewritten.
         """
         self.newFile = None
+        self.bytesRead = 0
         if not os.path.isfile(sourcePath):
             self.ui.set_info_how(f'!{_("File not found")}: "{norm_path(sourcePath)}".')
             return
 
         fileName, fileExtension = os.path.splitext(sourcePath)
+        if kwargs.get('incremental_sync', False):
+            self.journal = SyncJournal(f'{fileName}{SyncJournal.EXTENSION}', kwargs)
+        else:
+            self.journal = None
         if fileExtension == TlFile.EXTENSION:
             # Source is a timeline
             sourceFile = TlFile(sourcePath, **kwargs)
             targetFile = Yw7File(f'{fileName}{Yw7File.EXTENSION}', **kwargs)
+            targetFile.ignoredSceneFields = set(Yw7File.METADATA_ONLY)
+            # The scene contents are written back unchanged.
             if os.path.isfile(f'{fileName}{Yw7File.EXTENSION}'):
                 # Update existing yWriter project from timeline
                 self.import_to_yw(sourceFile, targetFile)
@@ -47,6 +56,8 @@ class TlConverter(YwCnvUi):
         elif fileExtension == Yw7File.EXTENSION:
             # Update existing timeline from yWriter project
             sourceFile = Yw7File(sourcePath, **kwargs)
+            sourceFile.ignoredSceneFields = set(Yw7File.METADATA_ONLY)
+            # Only the scene metadata is synchronized with the timeline.
             targetFile = TlFile(f'{fileName}{TlFile.EXTENSION}', **kwargs)
             self.export_from_yw(sourceFile, targetFile)
         else:
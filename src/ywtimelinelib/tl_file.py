@@ -11,10 +11,15 @@ from datetime import datetime
 from datetime import timedelta
 from pywriter.pywriter_globals import *
 from pywriter.file.file import File
+from pywriter.file.atomic_write import atomic_write
 from pywriter.model.novel import Novel
 from pywriter.model.chapter import Chapter
 from pywriter.yw.xml_indent import indent
+from pywriter.yw.xml_indent import indent_appended
+from pywriter.converter.phase_recorder import phase
 from ywtimelinelib.scene_event import SceneEvent
+from ywtimelinelib.scene_index import SceneIndex
+from ywtimelinelib.label_parser import LabelParser
 from ywtimelinelib.dt_helper import fix_iso_dt
 
 
@@ -24,6 +29,8 @@ class TlFile(File):
     Public methods:
         read() -- parse the file and get the instance variables.
         write() -- write instance variables to the file.
+        get_scenes_in_period(startDateTime, endDateTime) -- return the IDs of the scenes overlapping a period.
+        get_concurrent_scenes(scId) -- return the IDs of the scenes overlapping a scene.
 
     Public instance variables:
         ywProject: Yw7File -- the existing yWriter target project, if any.
@@ -35,6 +42,14 @@ class TlFile(File):
     DESCRIPTION = 'Timeline'
     EXTENSION = '.timeline'
     SUFFIX = None
+    CACHE_VARIANT = 'ywtimelinelib.tl_file.TlFile scene events'
+    # Identifies the scene event data in the project cache.
+
+    _SCENE_EVENT_TAGS = ('text', 'description', 'start', 'end')
+    # Event child elements read into scenes.
+
+    _CONTAINER_ID = re.compile(r'([\(\[][0-9]+[\)\]])')
+    # Container ID prefixed to an event title.
 
     def __init__(self, filePath, **kwargs):
         """Initialize instance variables and SceneEvent class variables.
@@ -50,6 +65,9 @@ class TlFile(File):
             default_date_time: str -- date/time stamp for undated yWriter scenes.
             scene_color: str -- color for events imported as scenes from yWriter.
         
+        Optional keyword arguments:
+            patch_timeline: bool -- splice only the changed events into the existing timeline file.
+
         If ignore_unspecific is True, only transfer Scenes with a specific 
             date/time stamp from yWriter to Timeline.
             
@@ -66,11 +84,26 @@ class TlFile(File):
             when synchronizing from Timeline. Use the date from default_date_time as a reference.
             Precondition: datetime_to_dhm is False.
             
+        If patch_timeline is True, the existing timeline file is kept verbatim, 
+            except for the changed, new, and removed scene events and the view range.
+            
         Extends the superclass constructor.
         """
         super().__init__(filePath, **kwargs)
         self._tree = None
-        self._sceneMarker = kwargs['scene_label']
+        self._treeStatus = None
+        # Size and modification time of the file when the XML tree was parsed or written.
+        self._sceneIndex = None
+        # Interval index over the scene events; built on the first query.
+        self._source = None
+        # Raw content of the timeline file, if it can be patched.
+        self._sourceEvents = []
+        self._eventSpans = []
+        self._eventStates = []
+        self._periodState = None
+        self._newline = '\n'
+        self._patchTimeline = kwargs.get('patch_timeline', False)
+        self._labelParser = LabelParser(kwargs['scene_label'])
         self._ignoreUnspecific = kwargs['ignore_unspecific']
         self._dateTimeToDhm = kwargs['datetime_to_dhm']
         self._dhmToDateTime = kwargs['dhm_to_datetime']
@@ -82,9 +115,27 @@ class TlFile(File):
     def read(self):
         """Parse the file and get the instance variables.
         
+        If the novel has no scenes yet, the whole XML tree is parsed, 
+        because it is needed for inserting the scene IDs.
+        Otherwise, the file is streamed, keeping only the scene event data.
+        With the project cache, the scene event data of an unchanged file is taken from the cache.
+        If the XML tree parsed or written last still matches the file, it is reused.
         Raise the "Error" exception in case of error. 
         Overrides the superclass method.
         """
+        if self._read_events():
+            # Rewrite the timeline with scene IDs inserted.
+            self._rewrite_file()
+
+    def _read_events(self):
+        """Get the scenes from the timeline's scene events.
+        
+        If the novel has no scenes yet, number the scene events, 
+        insert the scene IDs into the XML tree's event labels,
+        and assign the scenes to a single chapter.
+        Return True in this case, so the caller can save the scene IDs.
+        Raise the "Error" exception in case of error. 
+        """
 
         def remove_contId(event, text):
             """Separate container ID from event title.
@@ -98,13 +149,15 @@ class TlFile(File):
             Return the stripped string.
             """
             if text:
-                match = re.match(r'([\(\[][0-9]+[\)\]])', text)
+                match = self._CONTAINER_ID.match(text)
                 if match:
                     contId = match.group()
                     event.contId = contId
                     text = text.split(contId, 1)[1]
             return text
 
+        self._sceneIndex = None
+
         #--- Parse the Timeline file.
 
         if not self.novel.scenes:
@@ -112,56 +165,80 @@ class TlFile(File):
         else:
             isOutline = False
 
-        try:
-            self._tree = ET.parse(self.filePath)
-        except:
-            raise Error(f'{_("Can not process file")}: "{norm_path(self.filePath)}".')
-        root = self._tree.getroot()
-        sceneCount = 0
+        if self._is_tree_current():
+            sceneEvents = self._get_scene_events(self._tree.getroot().iter('event'), isOutline)
+        elif isOutline:
+            # The timeline is rewritten with scene IDs inserted, so the whole tree is needed.
+            self._source = None
+            self._treeStatus = None
+            try:
+                with phase('parse XML'):
+                    treeStatus = self._get_file_status()
+                    if self._patchTimeline:
+                        with open(self.filePath, 'rb') as f:
+                            source = f.read()
+                        self._bytesRead += len(source)
+                        self._tree = ET.ElementTree(ET.fromstring(source))
+                        self._scan_source(source)
+                    else:
+                        with open(self.filePath, 'rb') as f:
+                            self._tree = ET.parse(f)
+                            self._bytesRead += f.tell()
+            except:
+                raise Error(f'{_("Can not process file")}: "{norm_path(self.filePath)}".')
+            self._treeStatus = treeStatus
+            sceneEvents = self._get_scene_events(self._tree.getroot().iter('event'), isOutline)
+        else:
+            # Only the scene events are needed, so the file is streamed.
+            self._tree = None
+            self._treeStatus = None
+            self._source = None
+            sceneEvents = None
+            if self._cache is not None:
+                with phase('read cache'):
+                    sceneEvents = self._cache.get(self.filePath, self.CACHE_VARIANT)
+                if sceneEvents is None:
+                    sceneEvents = list(self._get_scene_events(self._iter_events(), isOutline))
+                    with phase('write cache'):
+                        self._cache.put(self.filePath, self.CACHE_VARIANT, sceneEvents)
+            else:
+                sceneEvents = self._get_scene_events(self._iter_events(), isOutline)
         scIdsByDate = {}
-        for event in root.iter('event'):
-            scId = None
-            sceneMatch = None
-            if event.find('labels') is not None:
-                labels = event.find('labels').text
-                sceneMatch = re.search(r'ScID\:([0-9]+)', labels)
-                if isOutline and sceneMatch is None:
-                    sceneMatch = re.search(self._sceneMarker, labels)
-            if sceneMatch is None:
-                continue
-
-            # The event is labeled as a scene.
+        dateTimes = []
+        # Arguments for SceneEvent.set_date_times().
+        pendingScIds = set()
+        for scId, texts in sceneEvents:
             sceneDate = None
             if isOutline:
-                sceneCount += 1
-                sceneMarker = sceneMatch.group()
-                scId = str(sceneCount)
-                event.find('labels').text = labels.replace(sceneMarker, f'ScID:{scId}')
                 self.novel.scenes[scId] = SceneEvent()
                 self.novel.scenes[scId].status = 1
             else:
+                if scId in pendingScIds:
+                    # Another event has the same scene ID, so its date is needed.
+                    SceneEvent.set_date_times(dateTimes)
+                    dateTimes = []
+                    pendingScIds.clear()
                 try:
-                    scId = sceneMatch.group(1)
                     sceneDate = self.novel.scenes[scId].date
                     self.novel.scenes[scId] = SceneEvent()
                 except:
                     continue
 
             try:
-                title = event.find('text').text
+                title = texts['text']
                 title = remove_contId(self.novel.scenes[scId], title)
                 title = self._convert_to_yw(title)
                 self.novel.scenes[scId].title = title
             except:
                 self.novel.scenes[scId].title = f'Scene {scId}'
             try:
-                self.novel.scenes[scId].desc = event.find('description').text
+                self.novel.scenes[scId].desc = texts['description']
             except:
                 pass
 
             #--- Set date/time/duration.
-            startDateTime = fix_iso_dt(event.find('start').text)
-            endDateTime = fix_iso_dt(event.find('end').text)
+            startDateTime = fix_iso_dt(texts['start'])
+            endDateTime = fix_iso_dt(texts['end'])
 
             # Consider unspecific date/time in the target file.
             if self._dateTimeToDhm and not self._dhmToDateTime:
@@ -172,10 +249,13 @@ class TlFile(File):
                 isUnspecific = True
             else:
                 isUnspecific = False
-            self.novel.scenes[scId].set_date_time(startDateTime, endDateTime, isUnspecific)
+            dateTimes.append((self.novel.scenes[scId], startDateTime, endDateTime, isUnspecific))
+            pendingScIds.add(scId)
             if not startDateTime in scIdsByDate:
                 scIdsByDate[startDateTime] = []
             scIdsByDate[startDateTime].append(scId)
+        with phase('convert date/time'):
+            SceneEvent.set_date_times(dateTimes)
 
         # Sort scenes by date/time
         srtScenes = sorted(scIdsByDate.items())
@@ -188,13 +268,26 @@ class TlFile(File):
             for __, scList in srtScenes:
                 for scId in scList:
                     self.novel.chapters[chId].srtScenes.append(scId)
-            # Rewrite the timeline with scene IDs inserted.
-            os.replace(self.filePath, f'{self.filePath}.bak')
-            try:
-                self._tree.write(self.filePath, xml_declaration=True, encoding='utf-8')
-            except:
-                os.replace(f'{self.filePath}.bak', self.filePath)
-                raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+        return isOutline
+
+    def _rewrite_file(self):
+        """Save the scene IDs inserted into the XML tree.
+        
+        Raise the "Error" exception in case of error. 
+        """
+        patchedSource = self._get_patched_source()
+        if patchedSource is not None and patchedSource == self._source:
+            # All scene IDs are already in place.
+            return
+
+        self._treeStatus = None
+        try:
+            with phase('rewrite file'):
+                self._write_file(patchedSource)
+        except:
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+
+        self._save_tree_status(patchedSource)
 
     def write(self):
         """Write instance variables to the file.
@@ -256,15 +349,26 @@ class TlFile(File):
                 pass
             return dtMin, dtMax
 
+        self._sceneIndex = None
+
         #--- Merge first.
         source = self.novel
         self.novel = Novel()
         if os.path.isfile(self.filePath):
-            self.read()
-            # initialize data
+            with phase('read existing file'):
+                self._read_events()
+            # The inserted scene IDs are saved with the changes,
+            # so the existing file is read, but not rewritten.
+            self._treeStatus = None
+        else:
+            self._tree = None
+            self._treeStatus = None
+            self._source = None
 
         self.novel.chapters = {}
         self.novel.srtChapters = []
+        dateTimes = []
+        # Arguments for SceneEvent.merge_date_times().
         for chId in source.srtChapters:
             self.novel.chapters[chId] = Chapter()
             self.novel.srtChapters.append(chId)
@@ -282,8 +386,10 @@ class TlFile(File):
                     title = add_contId(self.novel.scenes[scId], title)
                     self.novel.scenes[scId].title = title
                 self.novel.scenes[scId].desc = source.scenes[scId].desc
-                self.novel.scenes[scId].merge_date_time(source.scenes[scId])
+                dateTimes.append((self.novel.scenes[scId], source.scenes[scId]))
                 self.novel.scenes[scId].scType = source.scenes[scId].scType
+        with phase('convert date/time'):
+            SceneEvent.merge_date_times(dateTimes)
         scenes = list(self.novel.scenes)
         for scId in scenes:
             if not scId in source.scenes:
@@ -300,37 +406,43 @@ class TlFile(File):
             for scId in self.novel.chapters[chId].srtScenes:
                 if self.novel.scenes[scId].scType == 0:
                     srtScenes.append(scId)
+        patchedSource = None
         if self._tree is not None:
             #--- Update an existing XML _tree.
             root = self._tree.getroot()
             events = root.find('events')
-            trash = []
-            scIds = []
-
-            # Update events that are assigned to scenes.
-            for event in events.iter('event'):
-                if event.find('labels') is not None:
-                    labels = event.find('labels').text
-                    sceneMatch = re.search(r'ScID\:([0-9]+)', labels)
-                else:
-                    continue
-
-                if sceneMatch is not None:
-                    scId = sceneMatch.group(1)
-                    if scId in srtScenes:
-                        scIds.append(scId)
+            exportedScenes = set(srtScenes)
+            scIds = set()
+            xmlEventList = []
+            # The new list of the events' child elements.
+
+            with phase('build events'):
+                # Update events that are assigned to scenes.
+                for event in events:
+                    if event.tag == 'event' and event.find('labels') is not None:
+                        scId = self._labelParser.get_scene_id(event.find('labels').text)
+                        if scId is not None:
+                            if scId in exportedScenes:
+                                scIds.add(scId)
+                                dtMin, dtMax = self.novel.scenes[scId].build_subtree(event, scId, dtMin, dtMax)
+                            else:
+                                # Remove events that are assigned to missing scenes.
+                                continue
+
+                    xmlEventList.append(event)
+
+                # Add new events.
+                newEvents = []
+                for scId in srtScenes:
+                    if not scId in scIds:
+                        event = ET.Element('event')
                         dtMin, dtMax = self.novel.scenes[scId].build_subtree(event, scId, dtMin, dtMax)
-                    else:
-                        trash.append(event)
-
-            # Add new events.
-            for scId in srtScenes:
-                if not scId in scIds:
-                    event = ET.SubElement(events, 'event')
-                    dtMin, dtMax = self.novel.scenes[scId].build_subtree(event, scId, dtMin, dtMax)
-            # Remove events that are assigned to missing scenes.
-            for event in trash:
-                events.remove(event)
+                        newEvents.append(event)
+            events[:] = xmlEventList + newEvents
+            if not self._indentXml:
+                # Keep the file's formatting, and indent only the new events.
+                with phase('indent'):
+                    indent_appended(events, newEvents, 1)
 
             # Set the view range.
             dtMin, dtMax = set_view_range(dtMin, dtMax)
@@ -338,6 +450,8 @@ class TlFile(File):
             period = view.find('displayed_period')
             period.find('start').text = dtMin
             period.find('end').text = dtMax
+            with phase('patch file'):
+                patchedSource = self._get_patched_source()
         else:
             #--- Create a new XML _tree.
             root = ET.Element('timeline')
@@ -345,9 +459,10 @@ class TlFile(File):
             ET.SubElement(root, 'timetype').text = 'gregoriantime'
             ET.SubElement(root, 'categories')
             events = ET.SubElement(root, 'events')
-            for scId in srtScenes:
-                event = ET.SubElement(events, 'event')
-                dtMin, dtMax = self.novel.scenes[scId].build_subtree(event, scId, dtMin, dtMax)
+            with phase('build events'):
+                for scId in srtScenes:
+                    event = ET.SubElement(events, 'event')
+                    dtMin, dtMax = self.novel.scenes[scId].build_subtree(event, scId, dtMin, dtMax)
 
             # Set the view range.
             dtMin, dtMax = set_view_range(dtMin, dtMax)
@@ -355,25 +470,304 @@ class TlFile(File):
             period = ET.SubElement(view, 'displayed_period')
             ET.SubElement(period, 'start').text = dtMin
             ET.SubElement(period, 'end').text = dtMax
-        indent(root)
+        if patchedSource is None and self._indentXml:
+            with phase('indent'):
+                indent(root)
         self._tree = ET.ElementTree(root)
 
         #--- Back up the old timeline and write a new file.
-        backedUp = False
-        if os.path.isfile(self.filePath):
-            try:
-                os.replace(self.filePath, f'{self.filePath}.bak')
-            except:
-                raise Error(f'{_("Cannot overwrite file")}: "{norm_path(self.filePath)}".')
-            else:
-                backedUp = True
         try:
-            self._tree.write(self.filePath, xml_declaration=True, encoding='utf-8')
+            with phase('write file'):
+                self._write_file(patchedSource)
         except:
-            if backedUp:
-                os.replace(f'{self.filePath}.bak', self.filePath)
             raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
 
+        self._save_tree_status(patchedSource)
+
+    def get_scenes_in_period(self, startDateTime, endDateTime):
+        """Return a list of the IDs of the scenes overlapping a period, sorted by start date/time.
+        
+        Positional arguments:
+            startDateTime: str -- start of the period.
+            endDateTime: str -- end of the period.
+        
+        The period includes its start and end. Years may be "BC" or two-figure, as in Timeline.
+        """
+        return self._get_scene_index().get_overlapping(startDateTime, endDateTime)
+
+    def get_concurrent_scenes(self, scId):
+        """Return a list of the IDs of the other scenes overlapping a scene, sorted by start date/time.
+        
+        Positional arguments:
+            scId: str -- scene ID.
+        
+        If the scene has no event date/time, return an empty list.
+        """
+        return self._get_scene_index().get_concurrent(scId)
+
+    def _get_event_state(self, event):
+        """Return a list of the event's child element tags and texts."""
+        return [(child.tag, child.text) for child in event]
+
+    def _get_file_status(self):
+        """Return a tuple of the file's size and modification time."""
+        status = os.stat(self.filePath)
+        return status.st_size, status.st_mtime_ns
+
+    def _get_scene_index(self):
+        """Return the interval index over the scene events read or written last."""
+        if self._sceneIndex is None:
+            periods = []
+            for scId, scene in self.novel.scenes.items():
+                if isinstance(scene, SceneEvent):
+                    period = scene.get_period()
+                    if period is not None:
+                        periods.append((scId, *period))
+            self._sceneIndex = SceneIndex(periods)
+        return self._sceneIndex
+
+    def _get_patched_source(self):
+        """Return the raw file content with the changed scene events and the view range spliced in.
+        
+        Unchanged events are kept verbatim. Removed events are cut out, 
+        and new events are inserted at the end of the events section.
+        Return None, if the file cannot be patched.
+        """
+        if self._source is None:
+            return None
+
+        xmlEvents = list(self._tree.getroot().find('events'))
+        sourceEvents = set(self._sourceEvents)
+        keptEvents = [event for event in xmlEvents if event in sourceEvents]
+        if xmlEvents[:len(keptEvents)] != keptEvents:
+            # New events are not at the end.
+            return None
+
+        chunks = []
+        position = 0
+        i = 0
+        for event, (leadingSpace, start, end), state in zip(self._sourceEvents, self._eventSpans, self._eventStates):
+            if i < len(keptEvents) and keptEvents[i] is event:
+                i += 1
+                if state is not None and self._get_event_state(event) != state:
+                    chunks.append(self._source[position:start])
+                    chunks.append(self._serialize_event(event))
+                    position = end
+            else:
+                # Cut out the removed event, including the leading whitespace.
+                chunks.append(self._source[position:leadingSpace])
+                position = end
+        if i != len(keptEvents):
+            # The events have been reordered.
+            return None
+
+        newEvents = xmlEvents[len(keptEvents):]
+        if newEvents:
+            match = re.compile(rb'[ \t\r\n]*</events>').search(self._source, position)
+            if match is None:
+                return None
+
+            chunks.append(self._source[position:match.start()])
+            position = match.start()
+            for event in newEvents:
+                chunks.append(f'{self._newline}    '.encode('utf-8'))
+                chunks.append(self._serialize_event(event))
+
+        periodState = self._get_period_state()
+        if periodState != self._periodState:
+            match = re.compile(rb'<displayed_period>(.*?)</displayed_period>', re.DOTALL).search(self._source, position)
+            if match is None or periodState is None or None in periodState:
+                return None
+
+            period = match.group(1)
+            for tag, text in zip(('start', 'end'), periodState):
+                period, count = re.subn(f'<{tag}>[^<]*</{tag}>'.encode('utf-8'),
+                                        lambda m: f'<{tag}>{text}</{tag}>'.encode('utf-8'), period)
+                if count != 1:
+                    return None
+
+            chunks.append(self._source[position:match.start(1)])
+            chunks.append(period)
+            position = match.end(1)
+        chunks.append(self._source[position:])
+        return b''.join(chunks)
+
+    def _get_period_state(self):
+        """Return a tuple of the displayed period's start and end, or None if missing."""
+        try:
+            period = self._tree.getroot().find('view').find('displayed_period')
+            return period.find('start').text, period.find('end').text
+        except AttributeError:
+            return None
+
+    def _get_scene_events(self, xmlEvents, isOutline):
+        """Iterate over the events labeled as scenes.
+        
+        Positional arguments:
+            xmlEvents -- iterable of event elements.
+            isOutline: bool -- if True, number the scenes and insert the scene IDs into the labels. 
+        
+        Yield a tuple of the scene ID and a dictionary of the event's child element texts by tag.
+        """
+        sceneCount = 0
+        for event in xmlEvents:
+            xmlLabels = event.find('labels')
+            if xmlLabels is None:
+                continue
+
+            if isOutline:
+                sceneMarker = self._labelParser.get_scene_marker(xmlLabels.text)
+                if sceneMarker is None:
+                    continue
+
+                # The event is labeled as a scene.
+                sceneCount += 1
+                scId = str(sceneCount)
+                xmlLabels.text = xmlLabels.text.replace(sceneMarker, f'ScID:{scId}')
+            else:
+                scId = self._labelParser.get_scene_id(xmlLabels.text)
+                if scId is None:
+                    continue
+
+            texts = {}
+            for child in event:
+                if child.tag in self._SCENE_EVENT_TAGS and not child.tag in texts:
+                    texts[child.tag] = child.text
+            yield scId, texts
+
+    def _is_tree_current(self):
+        """Return True if the XML tree parsed or written last matches the file."""
+        if self._tree is None or self._treeStatus is None:
+            return False
+
+        if self._patchTimeline and self._source is None:
+            # The file's raw content is needed for patching.
+            return False
+
+        try:
+            return self._get_file_status() == self._treeStatus
+        except OSError:
+            return False
+
+    def _iter_events(self):
+        """Iterate over the Timeline file's event elements without building the whole tree.
+        
+        Each event element is discarded after being processed by the caller, 
+        so memory consumption does not grow with the number of events.
+        Raise the "Error" exception in case of error. 
+        """
+        try:
+            xmlEvents = None
+            with open(self.filePath, 'rb') as f:
+                for action, elem in ET.iterparse(f, events=('start', 'end')):
+                    if action == 'start':
+                        if elem.tag == 'events':
+                            xmlEvents = elem
+                    elif elem.tag == 'event':
+                        yield elem
+                        elem.clear()
+                        if xmlEvents is not None:
+                            try:
+                                xmlEvents.remove(elem)
+                            except ValueError:
+                                pass
+                self._bytesRead += f.tell()
+        except Exception:
+            raise Error(f'{_("Can not process file")}: "{norm_path(self.filePath)}".')
+
+    def _scan_source(self, source):
+        """Locate the events of the XML tree in the raw timeline file, so the file can be patched.
+        
+        Positional arguments:
+            source: bytes -- raw file content the XML tree is parsed from.
+        
+        If the events can not be located unambiguously, patching is disabled.
+        """
+        self._source = None
+        declaration = re.match(rb'(\xef\xbb\xbf)?<\?xml[^>]*encoding=["\']([^"\']+)', source)
+        if declaration is not None and declaration.group(2).lower() != b'utf-8':
+            return
+
+        events = self._tree.getroot().find('events')
+        if events is None:
+            return
+
+        xmlEvents = list(events)
+        eventSpans = []
+        end = 0
+        start = source.find(b'<event>')
+        while start >= 0:
+            leadingSpace = end + len(source[end:start].rstrip(b' \t\r\n'))
+            end = source.find(b'</event>', start)
+            if end < 0:
+                return
+
+            end += len(b'</event>')
+            eventSpans.append((leadingSpace, start, end))
+            start = source.find(b'<event>', end)
+        if len(eventSpans) != len(xmlEvents):
+            return
+
+        for event in xmlEvents:
+            if event.tag != 'event':
+                return
+
+        if b'\r\n' in source[:eventSpans[0][2] if eventSpans else None]:
+            self._newline = '\r\n'
+        else:
+            self._newline = '\n'
+        self._source = source
+        self._sourceEvents = xmlEvents
+        self._eventSpans = eventSpans
+        self._eventStates = []
+        for event in xmlEvents:
+            if event.find('labels') is None:
+                # Only labeled events can be assigned to scenes.
+                self._eventStates.append(None)
+            else:
+                self._eventStates.append(self._get_event_state(event))
+        self._periodState = self._get_period_state()
+
+    def _save_tree_status(self, patchedSource):
+        """Mark the XML tree as matching the file just written.
+        
+        Positional arguments:
+            patchedSource: bytes -- raw file content, if the file was patched.
+        """
+        if patchedSource is None:
+            self._source = None
+        else:
+            self._scan_source(patchedSource)
+        try:
+            self._treeStatus = self._get_file_status()
+        except OSError:
+            self._treeStatus = None
+
+    def _serialize_event(self, event):
+        """Return the event's XML representation as utf-8 encoded bytes, formatted like the events section."""
+        indent(event, 2)
+        tail = event.tail
+        event.tail = None
+        text = ET.tostring(event, encoding='unicode')
+        event.tail = tail
+        return text.replace('\n', self._newline).encode('utf-8')
+
+    def _write_file(self, patchedSource):
+        """Replace the timeline file atomically, keeping a backup.
+        
+        Positional arguments:
+            patchedSource: bytes -- raw file content, if the file is patched.
+        
+        Otherwise, the XML tree is written.
+        """
+        with atomic_write(self.filePath, self._get_backup_path(self.filePath)) as tempPath:
+            if patchedSource is None:
+                self._tree.write(tempPath, xml_declaration=True, encoding='utf-8')
+            else:
+                with open(tempPath, 'wb') as f:
+                    f.write(patchedSource)
+        self._rotate_backups(self.filePath)
+
     def _convert_to_yw(self, text):
         """Unmask brackets in yWriter scene titles.
         
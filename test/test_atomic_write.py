@@ -0,0 +1,112 @@
+"""Unit test for the atomic_write context manager.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import stat
+import unittest
+from shutil import rmtree
+from unittest import mock
+from pywriter.file.atomic_write import atomic_write
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# Test data
+TEST_DIR = TEST_EXEC_PATH + 'atomic'
+TEST_FILE = TEST_DIR + '/project.yw7'
+TEST_BAK = TEST_FILE + '.bak'
+
+
+def read_file(inputFile):
+    with open(inputFile, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def write_file(outputFile, text):
+    with open(outputFile, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+class AtomicWriteTest(unittest.TestCase):
+    """Test case: The file is replaced in a single step, or left unchanged."""
+
+    def setUp(self):
+        rmtree(TEST_DIR, ignore_errors=True)
+        os.mkdir(TEST_DIR)
+
+    def test_new_file(self):
+        with atomic_write(TEST_FILE, TEST_BAK) as tempPath:
+            self.assertNotEqual(tempPath, TEST_FILE)
+            self.assertFalse(os.path.isfile(TEST_FILE))
+            write_file(tempPath, 'new')
+        self.assertEqual(read_file(TEST_FILE), 'new')
+        self.assertEqual(sorted(os.listdir(TEST_DIR)), ['project.yw7'])
+
+    def test_backup(self):
+        write_file(TEST_FILE, 'old')
+        write_file(TEST_BAK, 'older')
+        oldStatus = os.stat(TEST_FILE)
+        with atomic_write(TEST_FILE, TEST_BAK) as tempPath:
+            write_file(tempPath, 'new')
+            self.assertEqual(read_file(TEST_FILE), 'old')
+        self.assertEqual(read_file(TEST_FILE), 'new')
+        self.assertEqual(read_file(TEST_BAK), 'old')
+        self.assertEqual(sorted(os.listdir(TEST_DIR)), ['project.yw7', 'project.yw7.bak'])
+        if os.name == 'posix':
+            # The backup is a hard link to the old file.
+            self.assertEqual(os.stat(TEST_BAK).st_ino, oldStatus.st_ino)
+            self.assertEqual(os.stat(TEST_BAK).st_nlink, 1)
+
+    def test_backup_copy(self):
+        write_file(TEST_FILE, 'old')
+        with mock.patch('os.link', side_effect=OSError):
+            with atomic_write(TEST_FILE, TEST_BAK) as tempPath:
+                write_file(tempPath, 'new')
+        self.assertEqual(read_file(TEST_FILE), 'new')
+        self.assertEqual(read_file(TEST_BAK), 'old')
+
+    def test_no_backup(self):
+        write_file(TEST_FILE, 'old')
+        with atomic_write(TEST_FILE) as tempPath:
+            write_file(tempPath, 'new')
+        self.assertEqual(read_file(TEST_FILE), 'new')
+        self.assertEqual(sorted(os.listdir(TEST_DIR)), ['project.yw7'])
+
+    def test_error(self):
+        write_file(TEST_FILE, 'old')
+        write_file(TEST_BAK, 'older')
+        with self.assertRaises(ValueError):
+            with atomic_write(TEST_FILE, TEST_BAK) as tempPath:
+                write_file(tempPath, 'trunc')
+                raise ValueError
+
+        self.assertEqual(read_file(TEST_FILE), 'old')
+        self.assertEqual(read_file(TEST_BAK), 'older')
+        self.assertEqual(sorted(os.listdir(TEST_DIR)), ['project.yw7', 'project.yw7.bak'])
+
+    @unittest.skipUnless(os.name == 'posix', 'POSIX file permissions')
+    def test_permissions(self):
+        write_file(TEST_FILE, 'old')
+        os.chmod(TEST_FILE, 0o640)
+        with atomic_write(TEST_FILE) as tempPath:
+            write_file(tempPath, 'new')
+        self.assertEqual(stat.S_IMODE(os.stat(TEST_FILE).st_mode), 0o640)
+
+    def tearDown(self):
+        rmtree(TEST_DIR, ignore_errors=True)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Unit test for the BackupRotation class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import gzip
+import unittest
+from shutil import rmtree
+from pywriter.file.atomic_write import atomic_write
+from pywriter.file.backup_rotation import BackupRotation
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# Test data
+TEST_DIR = TEST_EXEC_PATH + 'backups'
+TEST_FILE = TEST_DIR + '/project.yw7'
+
+
+def read_file(inputFile):
+    if inputFile.endswith('.gz'):
+        with gzip.open(inputFile, 'rt', encoding='utf-8') as f:
+            return f.read()
+
+    with open(inputFile, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class BackupRotationTest(unittest.TestCase):
+    """Test case: Numbered backups are compressed and deleted in the background."""
+
+    def setUp(self):
+        rmtree(TEST_DIR, ignore_errors=True)
+        os.mkdir(TEST_DIR)
+
+    def write_versions(self, maxCount, versionCount):
+        for version in range(versionCount):
+            backups = BackupRotation(TEST_FILE, maxCount)
+            with atomic_write(TEST_FILE, backups.get_backup_path()) as tempPath:
+                with open(tempPath, 'w', encoding='utf-8') as f:
+                    f.write(f'version {version}')
+            backups.rotate()
+        BackupRotation.wait()
+
+    def test_rotation(self):
+        self.write_versions(3, 6)
+        self.assertEqual(sorted(os.listdir(TEST_DIR)), [
+            'project.yw7',
+            'project.yw7.bk0003.gz',
+            'project.yw7.bk0004.gz',
+            'project.yw7.bk0005',
+            ])
+        self.assertEqual(read_file(TEST_FILE), 'version 5')
+        self.assertEqual(read_file(f'{TEST_FILE}.bk0005'), 'version 4')
+        self.assertEqual(read_file(f'{TEST_FILE}.bk0004.gz'), 'version 3')
+        self.assertEqual(read_file(f'{TEST_FILE}.bk0003.gz'), 'version 2')
+
+    def test_keep_all(self):
+        self.write_versions('0', 4)
+        self.assertEqual(sorted(os.listdir(TEST_DIR)), [
+            'project.yw7',
+            'project.yw7.bk0001.gz',
+            'project.yw7.bk0002.gz',
+            'project.yw7.bk0003',
+            ])
+
+    def test_interrupted_compression(self):
+        # Both versions of a backup are left over: The uncompressed one is deleted.
+        for fileName, text in (('project.yw7', 'version 3'),
+                               ('project.yw7.bk0001', 'version 0'),
+                               ('project.yw7.bk0009', 'version 1'),
+                               ('project.yw7.bk0010', 'version 2'),
+                               ('project.yw7.bak', 'single'),
+                               ('other.yw7.bk0011', 'other')):
+            with open(f'{TEST_DIR}/{fileName}', 'w', encoding='utf-8') as f:
+                f.write(text)
+        with gzip.open(f'{TEST_FILE}.bk0009.gz', 'wt', encoding='utf-8') as f:
+            f.write('version 1')
+        backups = BackupRotation(TEST_FILE, 'x')
+        self.assertEqual(backups.maxCount, BackupRotation.DEFAULT_COUNT)
+        self.assertEqual(backups.get_backup_path(), f'{TEST_FILE}.bk0011')
+        backups.rotate()
+        BackupRotation.wait()
+        self.assertEqual(sorted(os.listdir(TEST_DIR)), [
+            'other.yw7.bk0011',
+            'project.yw7',
+            'project.yw7.bak',
+            'project.yw7.bk0001.gz',
+            'project.yw7.bk0009.gz',
+            'project.yw7.bk0010',
+            ])
+        self.assertEqual(read_file(f'{TEST_FILE}.bk0001.gz'), 'version 0')
+        self.assertEqual(read_file(f'{TEST_FILE}.bk0009.gz'), 'version 1')
+
+    def tearDown(self):
+        rmtree(TEST_DIR, ignore_errors=True)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Unit test for the IdAllocator class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import random
+import unittest
+from pywriter.model.id_generator import create_id
+from pywriter.model.id_generator import IdAllocator
+
+
+class IdAllocatorTest(unittest.TestCase):
+    """Test case: The allocator returns the same IDs as create_id()."""
+
+    def test_random_operations(self):
+        rand = random.Random(42)
+        for __ in range(20):
+            existingIds = [str(rand.randint(1, 60)) for __ in range(rand.randint(0, 40))]
+            existingIds.extend(['0', '007', 'x', ''])
+            elements = dict.fromkeys(existingIds)
+            idAllocator = IdAllocator(existingIds)
+            for __ in range(200):
+                action = rand.random()
+                if action < 0.6:
+                    elemId = idAllocator.create_id()
+                    self.assertEqual(elemId, create_id(elements))
+                    elements[elemId] = None
+                elif action < 0.8 and elements:
+                    elemId = rand.choice(list(elements))
+                    idAllocator.remove(elemId)
+                    del elements[elemId]
+                else:
+                    elemId = str(rand.randint(1, 80))
+                    idAllocator.add(elemId)
+                    elements[elemId] = None
+                self.assertEqual(len(idAllocator), len(elements))
+            for elemId in elements:
+                self.assertIn(elemId, idAllocator)
+
+    def test_unknown_id(self):
+        idAllocator = IdAllocator(['1', '2'])
+        idAllocator.remove('5')
+        idAllocator.remove('02')
+        self.assertEqual(idAllocator.create_id(), '3')
+        idAllocator.remove('1')
+        self.assertEqual(idAllocator.create_id(), '1')
+        self.assertEqual(idAllocator.create_id(), '4')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Unit test for the IdList class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import copy
+import pickle
+import unittest
+from pywriter.model.id_list import IdList
+
+
+class IdListTest(unittest.TestCase):
+    """Test case: The membership index follows all list operations."""
+
+    def _assert_consistent(self, idList):
+        for elemId in ('1', '2', '3', '4', '5', '6'):
+            self.assertEqual(elemId in idList, elemId in list(idList), elemId)
+
+    def test_operations(self):
+        operations = [
+            lambda ids: ids.append('4'),
+            lambda ids: ids.extend(iter(['5', '5'])),
+            lambda ids: ids.insert(0, '6'),
+            lambda ids: ids.remove('5'),
+            lambda ids: ids.pop(),
+            lambda ids: ids.pop(0),
+            lambda ids: ids.__setitem__(0, '6'),
+            lambda ids: ids.__setitem__(slice(1, 3), iter(['4', '4', '4'])),
+            lambda ids: ids.__delitem__(slice(None, None, 2)),
+            lambda ids: ids.__delitem__(-1),
+            lambda ids: ids.__iadd__(['2']),
+            lambda ids: ids.__imul__(2),
+            lambda ids: ids.sort(),
+            lambda ids: ids.reverse(),
+            lambda ids: ids.clear(),
+            ]
+        idList = IdList(['1', '2', '3', '2'])
+        self._assert_consistent(idList)
+        for operation in operations:
+            operation(idList)
+            self._assert_consistent(idList)
+
+    def test_failed_operation(self):
+        idList = IdList(['1', '2', '3'])
+        with self.assertRaises(ValueError):
+            idList[::2] = ['4']
+        with self.assertRaises(ValueError):
+            idList.remove('4')
+        self.assertEqual(idList, ['1', '2', '3'])
+        self._assert_consistent(idList)
+
+    def test_copy(self):
+        idList = IdList(['1', '2'])
+        for duplicate in (idList.copy(), copy.copy(idList), copy.deepcopy(idList), pickle.loads(pickle.dumps(idList))):
+            self.assertIsInstance(duplicate, IdList)
+            duplicate.append('3')
+            self._assert_consistent(duplicate)
+            self.assertNotIn('3', idList)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
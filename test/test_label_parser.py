@@ -0,0 +1,58 @@
+"""Unit test for the LabelParser class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+import unittest
+from ywtimelinelib.label_parser import LabelParser
+
+SCENE_MARKERS = ['Scene', 'Sc[a-z]+', '^Scene', 'Scene$', 'Scene|Szene', '', 'x*', '(Scene)', '(?i)scene',
+                 '(?<=;)Scene']
+LABELS = ['Scene', 'ScID:12', 'Scene;ScID:3', 'ScID:4;Scene', 'ScID:;Scene', 'Plot;Scene', 'Plot;Szene;Scene',
+          'Plot\nScene', 'scene', 'Scenery;ScID:x', '', 'ScID:5;ScID:6']
+
+
+def search_scene_marker(sceneMarker, labels):
+    sceneMatch = re.search(r'ScID\:([0-9]+)', labels)
+    if sceneMatch is None:
+        sceneMatch = re.search(sceneMarker, labels)
+    if sceneMatch is None:
+        return None
+
+    return sceneMatch.group()
+
+
+class LabelParserTest(unittest.TestCase):
+    """Test case: The parser finds the same labels as separate searches."""
+
+    def test_get_scene_id(self):
+        labelParser = LabelParser('Scene')
+        for labels in LABELS * 2:
+            sceneMatch = re.search(r'ScID\:([0-9]+)', labels)
+            if sceneMatch is None:
+                self.assertIsNone(labelParser.get_scene_id(labels))
+            else:
+                self.assertEqual(labelParser.get_scene_id(labels), sceneMatch.group(1))
+
+    def test_get_scene_marker(self):
+        for sceneMarker in SCENE_MARKERS:
+            labelParser = LabelParser(sceneMarker)
+            for labels in LABELS * 2:
+                self.assertEqual(labelParser.get_scene_marker(labels), search_scene_marker(sceneMarker, labels),
+                                 (sceneMarker, labels))
+
+    def test_invalid_marker(self):
+        labelParser = LabelParser('(Scene')
+        self.assertEqual(labelParser.get_scene_marker('ScID:1'), 'ScID:1')
+        with self.assertRaises(re.error):
+            labelParser.get_scene_marker('Scene')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
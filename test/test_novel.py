@@ -0,0 +1,139 @@
+"""Unit test for the language scan and the word count of the Novel class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from concurrent import futures
+import pickle
+import unittest
+from unittest import mock
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from pywriter.model import scene as sceneModule
+
+
+def get_languages(text):
+    """Return the language codes like Novel.get_languages() did before caching."""
+    languages = []
+    m = sceneModule.LANGUAGE_TAG.search(text)
+    while m:
+        text = text[m.span()[1]:]
+        if not m.group(1) in languages:
+            languages.append(m.group(1))
+        m = sceneModule.LANGUAGE_TAG.search(text)
+    return languages
+
+
+class LanguageScanTest(unittest.TestCase):
+    """Test case: Only scenes with changed content are scanned again."""
+
+    def setUp(self):
+        self.novel = Novel()
+        texts = {
+            '1': 'Standard text [lang=en-AU]Australian text[/lang=en-AU].',
+            '2': '[lang=fr-FR]Bonjour[/lang=fr-FR] [lang=en-AU]G\'day[/lang=en-AU] [lang=de-CH]Grüezi[/lang=de-CH]',
+            '3': '',
+            '4': None,
+            '5': '[lang=]Empty[/lang=] [lang=fr-FR',
+            }
+        for scId, text in texts.items():
+            self.novel.scenes[scId] = Scene()
+            self.novel.scenes[scId].sceneContent = text
+
+    def test_languages(self):
+        self.novel.get_languages()
+        self.assertEqual(self.novel.languages, ['en-AU', 'fr-FR', 'de-CH', ''])
+        for scene in self.novel.scenes.values():
+            self.assertEqual(list(scene.languages), get_languages(scene.sceneContent or ''))
+
+    def test_cache(self):
+        self.novel.get_languages()
+        with mock.patch.object(sceneModule, 'LANGUAGE_TAG', wraps=sceneModule.LANGUAGE_TAG) as languageTag:
+            self.novel.get_languages()
+            self.assertEqual(languageTag.finditer.call_count, 0)
+
+            # Only the edited scene is scanned again.
+            self.novel.scenes['3'].sceneContent = '[lang=es-ES]Hola[/lang=es-ES]'
+            self.novel.scenes['1'].sceneContent = 'Standard text.'
+            self.novel.get_languages()
+            self.assertEqual(languageTag.finditer.call_count, 2)
+        self.assertEqual(self.novel.languages, ['fr-FR', 'en-AU', 'de-CH', 'es-ES', ''])
+
+    def test_pickle(self):
+        self.novel.get_languages()
+        scene = pickle.loads(pickle.dumps(self.novel.scenes['2']))
+        self.assertEqual(scene.languages, ('fr-FR', 'en-AU', 'de-CH'))
+        scene.sceneContent = 'Standard text.'
+        self.assertEqual(scene.languages, ())
+
+
+class WordCountTest(unittest.TestCase):
+    """Test case: Word and letter counts are computed on demand, once per scene content."""
+
+    def setUp(self):
+        self.novel = Novel()
+        texts = [
+            'One two three.',
+            'Hyphen-ated words --- and /*comments*/ [i]markup[/i].',
+            '',
+            None,
+            'Zwei Wörter.',
+            'Ein [lang=en-AU]mixed[/lang=en-AU] text.',
+            ]
+        for i in range(4):
+            for j, text in enumerate(texts):
+                scId = str(i * len(texts) + j + 1)
+                self.novel.scenes[scId] = Scene()
+                self.novel.scenes[scId].sceneContent = text
+
+    def test_lazy_count(self):
+        scene = self.novel.scenes['2']
+        self.assertIsNone(scene._wordCount)
+        self.assertIsNone(scene._letterCount)
+        with mock.patch.object(sceneModule, 'count_words', wraps=sceneModule.count_words) as countWords:
+            wordCount = scene.wordCount
+            letterCount = scene.letterCount
+            self.assertEqual(scene.wordCount, wordCount)
+            self.assertEqual(scene.letterCount, letterCount)
+            self.assertEqual(countWords.call_count, 1)
+        self.assertEqual((wordCount, letterCount), sceneModule.count_words(scene.sceneContent))
+
+    def test_invalidate(self):
+        scene = self.novel.scenes['1']
+        self.assertEqual(scene.wordCount, 3)
+        scene.sceneContent = 'One two three four.'
+        self.assertIsNone(scene._wordCount)
+        self.assertIsNone(scene._letterCount)
+        self.assertEqual(scene.wordCount, 4)
+        self.assertEqual(scene.letterCount, 19)
+
+    def test_set_count(self):
+        scene = self.novel.scenes['1']
+        with mock.patch.object(sceneModule, 'count_words', wraps=sceneModule.count_words) as countWords:
+            scene.wordCount = 42
+            scene.letterCount = 200
+            self.assertEqual(scene.wordCount, 42)
+            self.assertEqual(scene.letterCount, 200)
+            self.assertEqual(countWords.call_count, 0)
+
+    def test_workers(self):
+        self.novel.count_words()
+        expected = {scId: (scene._wordCount, scene._letterCount) for scId, scene in self.novel.scenes.items()}
+        for scene in self.novel.scenes.values():
+            scene.sceneContent = scene.sceneContent
+        with mock.patch.object(futures, 'ProcessPoolExecutor', wraps=futures.ProcessPoolExecutor) as executor:
+            self.novel.count_words(maxWorkers=2)
+            self.assertEqual(executor.call_count, 1)
+        for scId, scene in self.novel.scenes.items():
+            self.assertEqual((scene._wordCount, scene._letterCount), expected[scId])
+            if scene.sceneContent:
+                self.assertEqual(expected[scId], sceneModule.count_words(scene.sceneContent))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Unit test for the ProjectCache class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import glob
+import time
+import unittest
+from shutil import rmtree
+from pywriter.file.project_cache import ProjectCache
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# Test data
+TEST_CACHE = TEST_EXEC_PATH + 'cache'
+TEST_FILES = [f'{TEST_EXEC_PATH}cached{i}.yw7' for i in range(3)]
+
+
+def write_file(filePath, text):
+    with open(filePath, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def remove_all_testfiles():
+    for filePath in TEST_FILES:
+        try:
+            os.remove(filePath)
+        except:
+            pass
+    try:
+        rmtree(TEST_CACHE)
+    except:
+        pass
+
+
+class ProjectCacheTest(unittest.TestCase):
+    """Test case: Entries are invalidated and evicted."""
+
+    def setUp(self):
+        remove_all_testfiles()
+        for i, filePath in enumerate(TEST_FILES):
+            write_file(filePath, f'content {i}')
+
+    def _cache(self, filePath, data, cache=None):
+        if cache is None:
+            cache = ProjectCache(TEST_CACHE)
+        self.assertIsNone(cache.get(filePath, 'test'))
+        cache.put(filePath, 'test', data)
+        return cache
+
+    def test_hit(self):
+        self._cache(TEST_FILES[0], {'scenes': [1, 2]})
+        cache = ProjectCache(TEST_CACHE)
+        self.assertEqual(cache.get(TEST_FILES[0], 'test'), {'scenes': [1, 2]})
+        self.assertIsNone(cache.get(TEST_FILES[0], 'other variant'))
+        self.assertIsNone(cache.get(TEST_FILES[1], 'test'))
+
+    def test_changed_content(self):
+        self._cache(TEST_FILES[0], 'data')
+        status = os.stat(TEST_FILES[0])
+        write_file(TEST_FILES[0], 'content x')
+        os.utime(TEST_FILES[0], ns=(status.st_atime_ns, status.st_mtime_ns))
+        self.assertIsNone(ProjectCache(TEST_CACHE).get(TEST_FILES[0], 'test'))
+
+    def test_changed_while_parsing(self):
+        cache = ProjectCache(TEST_CACHE)
+        self.assertIsNone(cache.get(TEST_FILES[0], 'test'))
+        write_file(TEST_FILES[0], 'changed content')
+        cache.put(TEST_FILES[0], 'test', 'data')
+        self.assertIsNone(ProjectCache(TEST_CACHE).get(TEST_FILES[0], 'test'))
+
+    def test_corrupt_entry(self):
+        self._cache(TEST_FILES[0], 'data')
+        for entryPath in glob.glob(f'{TEST_CACHE}/*{ProjectCache.EXTENSION}'):
+            write_file(entryPath, 'garbage')
+        self.assertIsNone(ProjectCache(TEST_CACHE).get(TEST_FILES[0], 'test'))
+
+    def test_eviction(self):
+        cache = ProjectCache(TEST_CACHE, 0.01)
+        data = os.urandom(4000)
+        self._cache(TEST_FILES[0], data, cache)
+        time.sleep(0.05)
+        self._cache(TEST_FILES[1], data, cache)
+        time.sleep(0.05)
+        self.assertEqual(cache.get(TEST_FILES[0], 'test'), data)
+        # Now entry 1 is the least recently used one.
+        time.sleep(0.05)
+        self._cache(TEST_FILES[2], data, cache)
+        self.assertEqual(cache.get(TEST_FILES[0], 'test'), data)
+        self.assertEqual(cache.get(TEST_FILES[2], 'test'), data)
+        self.assertIsNone(cache.get(TEST_FILES[1], 'test'))
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
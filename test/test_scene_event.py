@@ -0,0 +1,175 @@
+"""Unit test for the SceneEvent batch date/time conversion.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import random
+import unittest
+import xml.etree.ElementTree as ET
+from pywriter.model.scene import Scene
+from ywtimelinelib import scene_event
+from ywtimelinelib.scene_event import SceneEvent
+
+DATE_TIME_VARIABLES = ('_startDateTime', '_endDateTime', 'date', 'time', 'day',
+                       'lastsDays', 'lastsHours', 'lastsMinutes')
+START_DATE_TIMES = ['2021-07-26 08:30:00', '1900-02-28 23:59:59', '0100-01-01 00:00:00', '0099-12-31 12:00:00',
+                    '0010-01-01 00:00:00', '-0500-03-01 10:00:00', '9999-12-31 23:00:00', '2024-02-29 12:00:00']
+END_DATE_TIMES = ['2021-07-26 09:15:00', '2021-08-02 07:00:00', '1900-03-01 00:00:00', '0100-01-01 00:00:00',
+                  '0099-12-31 12:00:00', '9999-12-31 23:59:59', '1800-01-01 00:00:00']
+DATES = [None, None, '2021-07-26', '1900-02-28', '0101-05-05', '9999-12-31', Scene.NULL_DATE]
+TIMES = [None, '', '08:30:00', '23:59:59']
+DAYS = [None, '', '0', '3', '-700000', '-5']
+DURATIONS = [None, '', '0', '1', '-2', '25', '70']
+
+
+def get_state(event):
+    return {name: getattr(event, name) for name in DATE_TIME_VARIABLES}
+
+
+def make_source(rand):
+    source = Scene()
+    source.date = rand.choice(DATES)
+    source.time = rand.choice(TIMES)
+    source.day = rand.choice(DAYS)
+    source.lastsDays = rand.choice(DURATIONS)
+    source.lastsHours = rand.choice(DURATIONS)
+    source.lastsMinutes = rand.choice(DURATIONS)
+    return source
+
+
+class BatchConversion(unittest.TestCase):
+    """Test case: The batch methods give the same results as the scalar methods."""
+
+    def _check_set_date_times(self):
+        rand = random.Random(1)
+        events = []
+        expected = []
+        for __ in range(500):
+            startDateTime = rand.choice(START_DATE_TIMES)
+            endDateTime = rand.choice(END_DATE_TIMES + [startDateTime])
+            isUnspecific = rand.choice((True, False))
+            event = SceneEvent()
+            event.set_date_time(startDateTime, endDateTime, isUnspecific)
+            expected.append(get_state(event))
+            events.append((SceneEvent(), startDateTime, endDateTime, isUnspecific))
+        SceneEvent.set_date_times(events)
+        self.assertEqual([get_state(event) for event, __, __, __ in events], expected)
+
+    def _check_merge_date_times(self):
+        rand = random.Random(2)
+        items = []
+        expected = []
+        for __ in range(500):
+            source = make_source(rand)
+            event = SceneEvent()
+            try:
+                event.merge_date_time(source)
+            except (ValueError, OverflowError):
+                # Checked below.
+                continue
+
+            expected.append(get_state(event))
+            items.append((SceneEvent(), source))
+        SceneEvent.merge_date_times(items)
+        self.assertEqual([get_state(event) for event, __ in items], expected)
+
+    def _check_errors(self):
+        source = Scene()
+        source.date = '2021-02-30'
+        with self.assertRaises(ValueError):
+            SceneEvent.merge_date_times([(SceneEvent(), source)])
+        source.date = '9999-12-31'
+        source.lastsDays = '1'
+        with self.assertRaises(OverflowError):
+            SceneEvent.merge_date_times([(SceneEvent(), source)])
+        with self.assertRaises(ValueError):
+            SceneEvent.set_date_times([(SceneEvent(), '2021-07-26 08:00:00', '2021-13-01 00:00:00', False)])
+
+    @unittest.skipIf(scene_event.np is None, 'NumPy is not installed')
+    def test_numpy(self):
+        self._check_set_date_times()
+        self._check_merge_date_times()
+        self._check_errors()
+
+    def test_scalar(self):
+        np = scene_event.np
+        scene_event.np = None
+        try:
+            self._check_set_date_times()
+            self._check_merge_date_times()
+            self._check_errors()
+        finally:
+            scene_event.np = np
+
+
+class BuildSubtree(unittest.TestCase):
+    """Test case: Event elements are updated and inserted in Timeline's order."""
+
+    def _build(self, event, desc):
+        sceneEvent = SceneEvent()
+        sceneEvent._startDateTime = '2021-07-26 08:00:00'
+        sceneEvent._endDateTime = '2021-07-26 09:00:00'
+        sceneEvent.title = 'Title'
+        sceneEvent.desc = desc
+        xmlEvent = ET.fromstring(event)
+        self.assertEqual(sceneEvent.build_subtree(xmlEvent, '5', '2021-07-27 00:00:00', None),
+                         ('2021-07-26 08:00:00', '2021-07-26 09:00:00'))
+        return [(child.tag, child.text) for child in xmlEvent]
+
+    def test_complete_event(self):
+        event = ('<event><start>x</start><end>x</end><text>x</text><progress>50</progress><fuzzy>True</fuzzy>'
+                 '<locked>True</locked><ends_today>False</ends_today><category>Item</category>'
+                 '<description>x</description><labels>ScID:5</labels><default_color>1,2,3</default_color></event>')
+        expected = [('start', '2021-07-26 08:00:00'), ('end', '2021-07-26 09:00:00'), ('text', 'Title'),
+                    ('progress', '50'), ('fuzzy', 'True'), ('locked', 'True'), ('ends_today', 'False'),
+                    ('category', 'Item'), ('description', 'Desc'), ('labels', 'ScID:5'), ('default_color', '1,2,3')]
+        self.assertEqual(self._build(event, 'Desc'), expected)
+        del expected[8]
+        self.assertEqual(self._build(event, None), expected)
+
+    def test_incomplete_event(self):
+        event = ('<event><start>x</start><text>x</text><fuzzy_start>True</fuzzy_start><category>Item</category>'
+                 '<labels>Scene</labels><milestone>False</milestone></event>')
+        expected = [('start', '2021-07-26 08:00:00'), ('end', '2021-07-26 09:00:00'), ('text', 'Title'),
+                    ('progress', '0'), ('fuzzy', 'False'), ('fuzzy_start', 'True'), ('locked', 'False'),
+                    ('ends_today', 'False'), ('category', 'Item'), ('description', 'Desc'), ('labels', 'Scene'),
+                    ('default_color', SceneEvent.sceneColor), ('milestone', 'False')]
+        self.assertEqual(self._build(event, 'Desc'), expected)
+
+    def test_out_of_order_event(self):
+        # The labels come first, and the default color is missing.
+        event = ('<event><labels>Scene</labels><start>x</start><end>x</end><text>x</text><progress>0</progress>'
+                 '<fuzzy>False</fuzzy><locked>False</locked><ends_today>False</ends_today></event>')
+        expected = [('labels', 'Scene'), ('start', '2021-07-26 08:00:00'), ('end', '2021-07-26 09:00:00'),
+                    ('text', 'Title'), ('progress', '0'), ('fuzzy', 'False'), ('locked', 'False'),
+                    ('ends_today', 'False'), ('description', 'Desc'), ('default_color', SceneEvent.sceneColor)]
+        self.assertEqual(self._build(event, 'Desc'), expected)
+
+        # The missing elements are inserted after their predecessors, not after the misplaced default color.
+        event = '<event><default_color>1,2,3</default_color><text>x</text><labels>Scene</labels></event>'
+        expected = [('start', '2021-07-26 08:00:00'), ('end', '2021-07-26 09:00:00'), ('default_color', '1,2,3'),
+                    ('text', 'Title'), ('progress', '0'), ('fuzzy', 'False'), ('locked', 'False'),
+                    ('ends_today', 'False'), ('labels', 'Scene')]
+        self.assertEqual(self._build(event, None), expected)
+
+        # A removed description does not determine where the labels are inserted.
+        event = '<event><milestone>False</milestone><description>x</description></event>'
+        expected = [('start', '2021-07-26 08:00:00'), ('end', '2021-07-26 09:00:00'), ('text', 'Title'),
+                    ('progress', '0'), ('fuzzy', 'False'), ('locked', 'False'), ('ends_today', 'False'),
+                    ('labels', 'ScID:5'), ('default_color', SceneEvent.sceneColor), ('milestone', 'False')]
+        self.assertEqual(self._build(event, None), expected)
+
+    def test_new_event(self):
+        expected = [('start', '2021-07-26 08:00:00'), ('end', '2021-07-26 09:00:00'), ('text', 'Title'),
+                    ('progress', '0'), ('fuzzy', 'False'), ('locked', 'False'), ('ends_today', 'False'),
+                    ('labels', 'ScID:5'), ('default_color', SceneEvent.sceneColor)]
+        self.assertEqual(self._build('<event/>', None), expected)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Unit test for the SceneIndex class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import random
+import unittest
+from shutil import copyfile
+from pywriter.model.novel import Novel
+from ywtimelinelib.dt_helper import get_dt_key
+from ywtimelinelib.scene_index import SceneIndex
+from ywtimelinelib.tl_file import TlFile
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# Test data
+TEST_TL = TEST_EXEC_PATH + 'sceneIndex.timeline'
+KWARGS = dict(
+    scene_label='Scene',
+    default_date_time='2021-07-26 00:00:00',
+    scene_color='170,240,160',
+    ignore_unspecific=False,
+    dhm_to_datetime=False,
+    datetime_to_dhm=False,
+)
+
+
+def remove_all_testfiles():
+    for filePath in (TEST_TL, f'{TEST_TL}.bak'):
+        try:
+            os.remove(filePath)
+        except:
+            pass
+
+
+def get_date_time(year, day, hour):
+    if year < 0:
+        return f'-{-year:04}-01-{day:02} {hour:02}:00:00'
+
+    return f'{year:04}-01-{day:02} {hour:02}:00:00'
+
+
+class SceneIndexTest(unittest.TestCase):
+    """Test case: Queries return the same scenes as a linear scan."""
+
+    def test_random_periods(self):
+        rand = random.Random(42)
+        years = (-1200, -120, -12, 12, 1920, 12000)
+        for eventCount in (0, 1, 2, 7, 16, 17, 100, 1000):
+            periods = []
+            for i in range(eventCount):
+                year = rand.choice(years)
+                day = rand.randint(1, 20)
+                hour = rand.randint(0, 23)
+                periods.append((str(i), get_date_time(year, day, hour),
+                                get_date_time(year, day + rand.choice((0, 0, 1, 5)), hour)))
+            sceneIndex = SceneIndex(periods)
+            self.assertEqual(len(sceneIndex), eventCount)
+            srtPeriods = sorted([(scId, get_dt_key(start), get_dt_key(end)) for scId, start, end in periods],
+                                key=lambda period: period[1])
+            for __ in range(50):
+                year = rand.choice(years)
+                day = rand.randint(1, 25)
+                start = get_date_time(year, day, 0)
+                end = get_date_time(year, day + rand.randint(0, 3), 0)
+                expected = [scId for scId, scStart, scEnd in srtPeriods
+                            if scStart <= get_dt_key(end) and get_dt_key(start) <= scEnd]
+                self.assertEqual(sceneIndex.get_overlapping(start, end), expected, (eventCount, start, end))
+            for scId, scStart, scEnd in srtPeriods[::10]:
+                expected = [i for i, start, end in srtPeriods if i != scId and start <= scEnd and scStart <= end]
+                self.assertEqual(sceneIndex.get_concurrent(scId), expected)
+
+    def test_touching_periods(self):
+        sceneIndex = SceneIndex([
+            ('1', '2021-07-26 08:00:00', '2021-07-26 10:00:00'),
+            ('2', '2021-07-26 10:00:00', '2021-07-26 10:00:00'),
+            ('3', '2021-07-26 10:00:01', '2021-07-26 12:00:00'),
+            ])
+        self.assertEqual(sceneIndex.get_concurrent('1'), ['2'])
+        self.assertEqual(sceneIndex.get_concurrent('3'), [])
+        self.assertEqual(sceneIndex.get_concurrent('4'), [])
+        self.assertEqual(sceneIndex.get_overlapping('2021-07-26 10:00:00', '2021-07-26 10:00:01'), ['1', '2', '3'])
+
+
+class TlFileTest(unittest.TestCase):
+    """Test case: Query the scene events read from a timeline."""
+
+    def setUp(self):
+        remove_all_testfiles()
+        copyfile(TEST_DATA_PATH + 'outline.timeline', TEST_TL)
+        self.tlFile = TlFile(TEST_TL, **KWARGS)
+        self.tlFile.novel = Novel()
+        self.tlFile.read()
+
+    def test_get_scenes_in_period(self):
+        self.assertEqual(self.tlFile.get_scenes_in_period('-100-01-01 00:00:00', '52-05-09 00:00:00'), ['5', '3', '4'])
+        self.assertEqual(self.tlFile.get_scenes_in_period('120-01-01 00:00:00', '121-08-23 01:05:38'), ['3'])
+        self.assertEqual(self.tlFile.get_scenes_in_period('2017-01-01 00:00:00', '2018-01-01 00:00:00'), [])
+
+    def test_get_concurrent_scenes(self):
+        self.assertEqual(self.tlFile.get_concurrent_scenes('3'), ['5', '4'])
+        self.assertEqual(self.tlFile.get_concurrent_scenes('1'), [])
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Startup benchmark for the yw-timeline script.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from shutil import copyfile
+from shutil import rmtree
+import os
+import sys
+import subprocess
+import unittest
+import yw_timeline_
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# Test data
+TEST_DIR = TEST_EXEC_PATH + 'startup'
+TEST_YW7 = TEST_DIR + '/project.yw7'
+TEST_TL = TEST_DIR + '/project.timeline'
+
+IMPORT_BUDGET = 1.0
+# Seconds for importing the script with all its modules, including the compilation without bytecode cache.
+# This is about eight times the time measured on a development machine, so it only catches gross regressions
+# on slow or loaded machines. The deferred modules are checked exactly.
+
+DEFERRED_MODULES = ('tkinter', 'numpy', 'concurrent.futures')
+# Modules that must not be imported at startup.
+
+
+def get_import_times(args):
+    """Run Python with "-X importtime" and return a dictionary of the cumulative import times in seconds.
+
+    Positional arguments:
+        args: list of the command line arguments passed to the interpreter.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(sys.path)
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + args,
+                             stdout=subprocess.PIPE,
+                             stderr=subprocess.PIPE,
+                             env=env,
+                             universal_newlines=True,
+                             )
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr)
+
+    importTimes = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        fields = line.split('|')
+        try:
+            importTimes[fields[2].strip()] = int(fields[1]) / 1000000
+        except ValueError:
+            # Header line
+            pass
+    return importTimes
+
+
+class Startup(unittest.TestCase):
+    """Test case: Silent runs start fast, not loading the modules that are needed by some code paths only."""
+
+    def setUp(self):
+        os.makedirs(TEST_DIR, exist_ok=True)
+
+    def tearDown(self):
+        rmtree(TEST_DIR, ignore_errors=True)
+
+    def _check_deferred(self, importTimes):
+        for moduleName in DEFERRED_MODULES:
+            self.assertFalse(moduleName in importTimes, f'{moduleName} is imported at startup.')
+
+    def test_import(self):
+        importTimes = get_import_times(['-c', 'import yw_timeline_'])
+        self._check_deferred(importTimes)
+        self.assertLess(importTimes['yw_timeline_'], IMPORT_BUDGET)
+
+    def test_silent_run(self):
+        copyfile(TEST_DATA_PATH + 'normal.yw7', TEST_YW7)
+        importTimes = get_import_times([yw_timeline_.__file__, '--silent', TEST_YW7])
+        self.assertTrue(os.path.isfile(TEST_TL))
+        self.assertFalse('tkinter' in importTimes, 'tkinter is imported in silent mode.')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
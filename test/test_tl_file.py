@@ -0,0 +1,171 @@
+"""Unit test for the event streaming of the TlFile class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import unittest
+from unittest import mock
+import xml.etree.ElementTree as ET
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from ywtimelinelib.tl_file import TlFile
+from ywtimelinelib.scene_event import SceneEvent
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# Test data
+TEST_TL = TEST_EXEC_PATH + 'events.timeline'
+TEST_FILES = [
+    'normal.timeline',
+    'modified.timeline',
+    'modified2.timeline',
+    'new.timeline',
+    'outline.timeline',
+    'patched.timeline',
+    'rewritten.timeline',
+    ]
+KWARGS = dict(
+    scene_label='Scene',
+    ignore_unspecific=False,
+    datetime_to_dhm=False,
+    dhm_to_datetime=False,
+    default_date_time='2021-07-26 00:00:00',
+    scene_color='170,240,160',
+    )
+TIMELINE = '''<?xml version='1.0' encoding='utf-8'?>
+<timeline>
+  <version>2.4.0 (3f207fbb63f0 2021-04-07)</version>
+  <timetype>gregoriantime</timetype>
+  <categories>
+    <category>
+      <name>Item</name>
+    </category>
+  </categories>
+  <events>
+    <event>
+      <start>2021-07-26 10:00:00</start>
+      <end>2021-07-26 11:00:00</end>
+      <text>First scene</text>
+      <labels>ScID:1</labels>
+    </event>
+    <container>
+      <text>Not an event</text>
+      <labels>ScID:9</labels>
+    </container>
+    <event>
+      <start>2021-07-27 10:00:00</start>
+      <end>2021-07-27 11:00:00</end>
+      <text>Without labels</text>
+    </event>
+    <event>
+      <start>2021-07-28 10:00:00</start>
+      <end>2021-07-28 11:00:00</end>
+      <text>Not a scene</text>
+      <labels>Plot</labels>
+    </event>
+    <event>
+      <start>2021-07-29 10:00:00</start>
+      <end>2021-07-29 11:00:00</end>
+      <text>Second scene</text>
+      <description>Described</description>
+      <labels>ScID:2</labels>
+    </event>
+  </events>
+  <view>
+    <displayed_period>
+      <start>2021-07-25 00:00:00</start>
+      <end>2021-07-30 00:00:00</end>
+    </displayed_period>
+  </view>
+</timeline>
+'''
+
+
+def get_parsed_scene_events(tlFile, isOutline):
+    """Return the scene events the way they were read before streaming, from the whole XML tree."""
+    root = ET.parse(tlFile.filePath).getroot()
+    return list(tlFile._get_scene_events(root.iter('event'), isOutline))
+
+
+def remove_all_testfiles():
+    for filePath in (TEST_TL, f'{TEST_TL}.bak'):
+        try:
+            os.remove(filePath)
+        except:
+            pass
+
+
+class IterEventsTest(unittest.TestCase):
+    """Test case: Streaming the events gives the same scene events as parsing the whole tree."""
+
+    def setUp(self):
+        remove_all_testfiles()
+        with open(TEST_TL, 'w', encoding='utf-8') as f:
+            f.write(TIMELINE)
+        self.tlFile = TlFile(TEST_TL, **KWARGS)
+        self.tlFile.novel = Novel()
+
+    def test_skipped_elements(self):
+        xmlEvents = list(self.tlFile._iter_events())
+        self.assertEqual(len(xmlEvents), 4)
+        self.assertEqual([xmlEvent.tag for xmlEvent in xmlEvents], ['event'] * 4)
+        sceneEvents = list(self.tlFile._get_scene_events(self.tlFile._iter_events(), False))
+        self.assertEqual(sceneEvents, [
+            ('1', {'start': '2021-07-26 10:00:00', 'end': '2021-07-26 11:00:00', 'text': 'First scene'}),
+            ('2', {'start': '2021-07-29 10:00:00', 'end': '2021-07-29 11:00:00', 'text': 'Second scene',
+                   'description': 'Described'}),
+            ])
+        self.assertEqual(self.tlFile.bytesRead, 2 * os.path.getsize(TEST_TL))
+
+    def test_fixtures(self):
+        for fileName in TEST_FILES + [TEST_TL]:
+            with self.subTest(fileName=fileName):
+                tlFile = TlFile(os.path.join(TEST_DATA_PATH, fileName), **KWARGS)
+                self.assertEqual(list(tlFile._get_scene_events(tlFile._iter_events(), False)),
+                                 get_parsed_scene_events(tlFile, False))
+
+    def test_read_streaming(self):
+        for scId in ('1', '2', '3'):
+            self.tlFile.novel.scenes[scId] = Scene()
+        with mock.patch.object(TlFile, '_iter_events', autospec=True, side_effect=TlFile._iter_events) as iterEvents:
+            self.tlFile.read()
+            self.assertEqual(iterEvents.call_count, 1)
+        self.assertIsNone(self.tlFile._tree)
+        self.assertEqual(self.tlFile.novel.scenes['1'].title, 'First scene')
+        self.assertEqual(self.tlFile.novel.scenes['2'].desc, 'Described')
+        self.assertIsInstance(self.tlFile.novel.scenes['1'], SceneEvent)
+        self.assertNotIsInstance(self.tlFile.novel.scenes['3'], SceneEvent)
+
+    def test_read_outline(self):
+        with open(TEST_TL, 'w', encoding='utf-8') as f:
+            f.write(TIMELINE.replace('ScID:1', 'Scene').replace('ScID:2', 'Scene').replace('ScID:9', 'Scene'))
+        with mock.patch.object(TlFile, '_iter_events', autospec=True, side_effect=TlFile._iter_events) as iterEvents:
+            self.tlFile.read()
+            self.assertEqual(iterEvents.call_count, 0)
+
+        # The whole tree is kept, so the scene IDs can be written back.
+        self.assertIsNotNone(self.tlFile._tree)
+        labels = [xmlLabels.text for xmlLabels in self.tlFile._tree.getroot().iter('labels')]
+        self.assertEqual(labels, ['ScID:1', 'Scene', 'Plot', 'ScID:2'])
+        self.assertEqual(self.tlFile.novel.chapters['1'].srtScenes, ['1', '2'])
+        self.assertEqual(self.tlFile.novel.scenes['2'].desc, 'Described')
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+"""Regression test for the yWriter 7 project file writer.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-timeline
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import re
+import json
+import unittest
+import xml.etree.ElementTree as ET
+from html import unescape
+from pywriter.pywriter_globals import Error
+from pywriter.model.novel import Novel
+from pywriter.yw.yw7_file import Yw7File
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+TEST_EXEC_PATH = TEST_PATH + '/'
+
+# Test data
+TEST_YW7 = TEST_EXEC_PATH + 'yw7 Sample Project.yw7'
+TEST_REFERENCE = TEST_EXEC_PATH + 'reference.yw7'
+TEST_ORIGINAL = TEST_EXEC_PATH + 'original.yw7'
+TEST_NOVELS = TEST_DATA_PATH + 'novels.json'
+TEST_FILES = [
+    'normal.yw7',
+    'modified.yw7',
+    'modified2.yw7',
+    'dateTimeToDhm.yw7',
+    'dhmToDateTime.yw7',
+    'elements.yw7',
+    ]
+TRICKY_TEXTS = [
+    ' \nleading space and line break',
+    'trailing line break\n',
+    'Windows line breaks\r\nand a carriage return\rhere',
+    'markup: &amp; &lt;b&gt; <i>italic</i> "quoted" \'apostrophe\' & ampersand',
+    'embedded [CDATA[ \nmarker and line break\n]] before brackets',
+    'ends with a bracket\n]',
+    '[lang=en-AU]Australian text[/lang=en-AU]',
+    '',
+    ]
+
+
+def read_bytes(filePath):
+    with open(filePath, 'rb') as f:
+        return f.read()
+
+
+def novel_to_dict(novel):
+    """Return the novel's contents as built-in types, for comparing with the JSON reference."""
+    novelDict = dict(vars(novel))
+    for collection in ('chapters', 'scenes', 'characters', 'locations', 'items', 'projectNotes'):
+        novelDict[collection] = {elemId: vars(element) for elemId, element in getattr(novel, collection).items()}
+    return json.loads(json.dumps(novelDict))
+
+
+def read_novel(filePath, ywClass=Yw7File):
+    ywFile = ywClass(filePath)
+    ywFile.novel = Novel()
+    ywFile.read()
+    return ywFile.novel
+
+
+def remove_all_testfiles():
+    for filePath in (TEST_YW7, TEST_REFERENCE, TEST_ORIGINAL):
+        for path in (filePath, f'{filePath}.bak'):
+            try:
+                os.remove(path)
+            except:
+                pass
+
+
+class SinglePassWriter(Yw7File):
+    """Yw7File subclass writing a reference file the way it was done before."""
+
+    def write_reference(self, filePath):
+        """Write the tree with ElementTree and postprocess it."""
+        self._build_element_tree()
+        self.tree.write(filePath, xml_declaration=False, encoding='utf-8')
+        self._postprocess_xml_file(filePath)
+
+    def _postprocess_xml_file(self, filePath):
+        """Postprocess an xml file created by ElementTree.
+        
+        Positional argument:
+            filePath: str -- path to xml file.
+        
+        Read the xml file, put a header on top, insert the missing CDATA tags,
+        and replace xml entities by plain text (unescape). Overwrite the .yw7 xml file.
+        
+        This is the former Yw7File routine, kept as reference for the single pass writer.
+        """
+        with open(filePath, 'r', encoding='utf-8') as f:
+            text = f.read()
+        lines = text.split('\n')
+        newlines = ['<?xml version="1.0" encoding="utf-8"?>']
+        for line in lines:
+            for tag in self._CDATA_TAGS:
+                line = re.sub(fr'\<{tag}\>', f'<{tag}><![CDATA[', line)
+                line = re.sub(fr'\<\/{tag}\>', f']]></{tag}>', line)
+            newlines.append(line)
+        text = '\n'.join(newlines)
+        text = text.replace('[CDATA[ \n', '[CDATA[')
+        text = text.replace('\n]]', ']]')
+        if not self.novel.chapters:
+            text = text.replace('<CHAPTERS />', '<CHAPTERS></CHAPTERS>')
+            # otherwise, yWriter fails to parse the file if there are no chapters.
+        text = unescape(text)
+        with open(filePath, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def write_single_pass(self, filePath):
+        """Write the tree in a single pass."""
+        self._build_element_tree()
+        self._write_xml_file(filePath, self.tree.getroot())
+
+
+class SerializerRegression(unittest.TestCase):
+    """Test case: The single pass writer produces the same output as postprocessing."""
+
+    def setUp(self):
+        remove_all_testfiles()
+
+    def _assert_same_output(self, ywFile):
+        ywFile.write_reference(TEST_REFERENCE)
+        ywFile.write_single_pass(TEST_YW7)
+        self.assertEqual(read_bytes(TEST_YW7), read_bytes(TEST_REFERENCE))
+
+    def _read(self, fileName):
+        ywFile = SinglePassWriter(TEST_DATA_PATH + fileName)
+        ywFile.novel = Novel()
+        ywFile.read()
+        return ywFile
+
+    def test_fixtures(self):
+        for fileName in TEST_FILES:
+            with self.subTest(fileName=fileName):
+                self._assert_same_output(self._read(fileName))
+
+    def test_tricky_texts(self):
+        ywFile = self._read('normal.yw7')
+        for text in TRICKY_TEXTS:
+            with self.subTest(text=text):
+                for scId in ywFile.novel.scenes:
+                    ywFile.novel.scenes[scId].sceneContent = text
+                    ywFile.novel.scenes[scId].desc = text
+                    ywFile.novel.scenes[scId].notes = text
+                    ywFile.novel.scenes[scId].title = text
+                self._assert_same_output(ywFile)
+
+    def test_no_chapters(self):
+        ywFile = self._read('normal.yw7')
+        ywFile.novel.chapters = {}
+        ywFile.novel.srtChapters = []
+        self._assert_same_output(ywFile)
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+class SmallChunkReader(Yw7File):
+    """Yw7File subclass decoding a few bytes at a time, so characters are split between chunks."""
+    _READ_CHUNK_SIZE = 7
+
+
+class ReaderRegression(unittest.TestCase):
+    """Test case: The reader produces the same Novel contents as before."""
+
+    def test_fixtures(self):
+        with open(TEST_NOVELS, encoding='utf-8') as f:
+            novels = json.load(f)
+        for fileName in TEST_FILES:
+            with self.subTest(fileName=fileName):
+                self.assertEqual(novel_to_dict(read_novel(TEST_DATA_PATH + fileName)), novels[fileName])
+
+    def test_encodings(self):
+        with open(TEST_DATA_PATH + 'modified.yw7', encoding='utf-8-sig') as f:
+            xmlText = f.read().replace('Szene', 'Szène \u2713')
+        with open(TEST_YW7, 'w', encoding='utf-8') as f:
+            f.write(xmlText)
+        reference = novel_to_dict(read_novel(TEST_YW7))
+        self.assertIn('Die erste Szène \u2713', [scene['title'] for scene in reference['scenes'].values()])
+        variants = [
+            ('utf-8-sig', xmlText),
+            ('utf-16', xmlText),
+            ('utf-16-le', xmlText),
+            ('utf-16-be', xmlText),
+            ('utf-8', xmlText.replace('Szène', 'Sz\x07ène\x1f')),
+            ]
+        for encoding, text in variants:
+            with self.subTest(encoding=encoding, controlCharacters=text is not xmlText):
+                with open(TEST_YW7, 'w', encoding=encoding) as f:
+                    f.write(text)
+                for ywClass in (Yw7File, SmallChunkReader):
+                    self.assertEqual(novel_to_dict(read_novel(TEST_YW7, ywClass)), reference)
+
+    def test_invalid_encoding(self):
+        with open(TEST_DATA_PATH + 'modified.yw7', encoding='utf-8-sig') as f:
+            xmlText = f.read().replace('Szene', 'Szène')
+        with open(TEST_YW7, 'w', encoding='latin-1') as f:
+            f.write(xmlText)
+        with self.assertRaises(Error):
+            read_novel(TEST_YW7)
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def split_unread_elements(filePath):
+    """Parse a yw7 file and remove the scene elements that are not read with METADATA_ONLY.
+    
+    Return the serialized remaining tree, and a dictionary of the serialized removed elements by scene ID.
+    """
+    root = ET.parse(filePath).getroot()
+    unreadElements = {}
+    for xmlScene in root.find('SCENES'):
+        scId = xmlScene.find('ID').text
+        unreadElements[scId] = {}
+        for tag in Yw7File.METADATA_ONLY:
+            element = xmlScene.find(tag)
+            if element is not None:
+                xmlScene.remove(element)
+                element.tail = None
+                if element.text and element.text.endswith('\n'):
+                    # The writer trims a line break at the end of a CDATA section, whether it is read or not.
+                    element.text = element.text[:-1]
+                unreadElements[scId][tag] = ET.tostring(element, encoding='utf-8')
+    for element in root.iter():
+        element.tail = None
+    return ET.tostring(root, encoding='utf-8'), unreadElements
+
+
+class MetadataOnlyRoundTrip(unittest.TestCase):
+    """Test case: Scene elements not read with METADATA_ONLY are written back unchanged."""
+
+    def setUp(self):
+        remove_all_testfiles()
+
+    def _write(self, sourcePath, filePath, ignoredSceneFields):
+        with open(sourcePath, 'rb') as f:
+            data = f.read()
+        with open(filePath, 'wb') as f:
+            f.write(data)
+        ywFile = Yw7File(filePath)
+        ywFile.novel = Novel()
+        ywFile.ignoredSceneFields = ignoredSceneFields
+        ywFile.read()
+        ywFile.write()
+        return ywFile.novel
+
+    def _assert_round_trip(self, sourcePath):
+        referenceNovel = self._write(sourcePath, TEST_REFERENCE, set())
+        novel = self._write(sourcePath, TEST_YW7, set(Yw7File.METADATA_ONLY))
+        self.assertEqual(novel.languages, referenceNovel.languages)
+        originalTree, originalElements = split_unread_elements(sourcePath)
+        tree, unreadElements = split_unread_elements(TEST_YW7)
+        referenceTree, __ = split_unread_elements(TEST_REFERENCE)
+
+        # The unread elements are the same as in the original file.
+        for scId in originalElements:
+            for tag in originalElements[scId]:
+                self.assertEqual(unreadElements[scId][tag], originalElements[scId][tag])
+
+        # The rest, including the languages and the dropped word counts, is the same as with a full read.
+        self.assertEqual(tree, referenceTree)
+        return novel
+
+    def test_fixtures(self):
+        for fileName in TEST_FILES:
+            with self.subTest(fileName=fileName):
+                self._assert_round_trip(TEST_DATA_PATH + fileName)
+
+    def test_languages(self):
+        with open(TEST_DATA_PATH + 'elements.yw7', encoding='utf-8') as f:
+            xmlText = f.read()
+        xmlText = xmlText.replace('The boat came in at dusk.', 'The boat came in at [lang=en-AU]dusk[/lang=en-AU].')
+        xmlText = xmlText.replace('<Title>lang=fr-FR</Title>', '<Title>No language</Title>')
+        # Without language definitions in the project, the languages are collected from the scene contents.
+        with open(TEST_ORIGINAL, 'w', encoding='utf-8') as f:
+            f.write(xmlText)
+        novel = self._assert_round_trip(TEST_ORIGINAL)
+        self.assertEqual(novel.languages, ['en-AU'])
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,18 @@ For further information see https://github.com/peter88213/yw-timeline
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 from shutil import copyfile
+from shutil import copy2
+from shutil import rmtree
 import os
 import unittest
+import xml.etree.ElementTree as ET
 import yw_timeline_
+from pywriter.yw.xml_indent import indent
+from pywriter.converter.phase_recorder import PhaseRecorder
+from pywriter.converter.phase_recorder import phase
+from pywriter.file.backup_rotation import BackupRotation
+from pywriter.model.novel import Novel
+from ywtimelinelib.tl_file import TlFile
 
 UPDATE = False
 
@@ -25,6 +34,8 @@ TEST_YW7 = TEST_EXEC_PATH + 'yw7 Sample Project.yw7'
 TEST_YW_BAK = TEST_YW7 + '.bak'
 TEST_TL = TEST_EXEC_PATH + 'yw7 Sample Project.timeline'
 TEST_TL_BAK = TEST_TL + '.bak'
+TEST_JOURNAL = TEST_EXEC_PATH + 'yw7 Sample Project.tlsync'
+TEST_CACHE = TEST_EXEC_PATH + 'cache'
 INI_FILE = 'yw-timeline.ini'
 
 
@@ -38,6 +49,12 @@ def read_file(inputFile):
             return f.read()
 
 
+def read_indented_xml(inputFile):
+    root = ET.parse(inputFile).getroot()
+    indent(root)
+    return ET.tostring(root)
+
+
 def remove_all_testfiles():
     try:
         os.remove(TEST_YW7)
@@ -59,6 +76,17 @@ def remove_all_testfiles():
         os.remove(TEST_YW_BAK)
     except:
         pass
+    try:
+        os.remove(TEST_JOURNAL)
+    except:
+        pass
+    try:
+        rmtree(TEST_CACHE)
+    except:
+        pass
+    for fileName in os.listdir(TEST_EXEC_PATH):
+        if '.bk0' in fileName:
+            os.remove(TEST_EXEC_PATH + fileName)
 
 
 class NormalOperation(unittest.TestCase):
@@ -91,6 +119,215 @@ class NormalOperation(unittest.TestCase):
         self.assertEqual(read_file(TEST_TL), read_file(TEST_DATA_PATH + 'modified.timeline'))
         self.assertEqual(read_file(TEST_TL_BAK), read_file(TEST_DATA_PATH + 'normal.timeline'))
 
+    # @unittest.skip('')
+    def test_incremental_sync(self):
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        copyfile(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+        copyfile(TEST_DATA_PATH + 'incrementalSync.ini', TEST_EXEC_PATH + INI_FILE)
+        os.chdir(TEST_EXEC_PATH)
+        yw_timeline_.run(TEST_YW7, silentMode=True)
+        self.assertEqual(read_file(TEST_TL), read_file(TEST_DATA_PATH + 'modified.timeline'))
+        self.assertTrue(os.path.isfile(TEST_JOURNAL))
+
+        # Nothing changed: The timeline is not rewritten.
+        os.remove(TEST_TL_BAK)
+        yw_timeline_.run(TEST_YW7, silentMode=True)
+        self.assertFalse(os.path.isfile(TEST_TL_BAK))
+
+        # The yWriter project is rewritten: The scenes are compared.
+        copyfile(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+        yw_timeline_.run(TEST_YW7, silentMode=True)
+        self.assertFalse(os.path.isfile(TEST_TL_BAK))
+
+        # The timeline is changed: It is rewritten.
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        yw_timeline_.run(TEST_YW7, silentMode=True)
+        self.assertEqual(read_file(TEST_TL), read_file(TEST_DATA_PATH + 'modified.timeline'))
+        self.assertTrue(os.path.isfile(TEST_TL_BAK))
+
+    # @unittest.skip('')
+    def test_patch_timeline(self):
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        copyfile(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+        copyfile(TEST_DATA_PATH + 'patchTimeline.ini', TEST_EXEC_PATH + INI_FILE)
+        os.chdir(TEST_EXEC_PATH)
+        yw_timeline_.run(TEST_YW7, silentMode=True)
+        if UPDATE:
+            copyfile(TEST_TL, TEST_DATA_PATH + 'patched.timeline')
+        self.assertEqual(read_file(TEST_TL), read_file(TEST_DATA_PATH + 'patched.timeline'))
+        self.assertEqual(read_file(TEST_TL_BAK), read_file(TEST_DATA_PATH + 'normal.timeline'))
+
+    # @unittest.skip('')
+    def test_batch(self):
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        copyfile(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+        os.chdir(TEST_EXEC_PATH)
+        missingYw7 = TEST_EXEC_PATH + 'missing.yw7'
+        summary = yw_timeline_.run_batch([TEST_YW7, missingYw7], workers=2)
+        self.assertEqual(read_file(TEST_TL), read_file(TEST_DATA_PATH + 'modified.timeline'))
+        self.assertEqual(summary['failed'], 1)
+        self.assertEqual([result['sourcePath'] for result in summary['files']], [TEST_YW7, missingYw7])
+        self.assertEqual(summary['files'][0]['status'], 'ok')
+        self.assertEqual(summary['files'][0]['bytesWritten'], os.path.getsize(TEST_TL))
+        self.assertEqual(summary['files'][1]['status'], 'failed')
+        self.assertEqual(yw_timeline_.expand_paths([TEST_EXEC_PATH]), [TEST_YW7])
+
+    # @unittest.skip('')
+    def test_batch_bytes_read(self):
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        copyfile(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+        copyfile(TEST_DATA_PATH + 'incrementalSync.ini', TEST_EXEC_PATH + INI_FILE)
+        os.chdir(TEST_EXEC_PATH)
+        bytesRead = os.path.getsize(TEST_YW7) + os.path.getsize(TEST_TL)
+        summary = yw_timeline_.sync_file(TEST_YW7)
+        self.assertEqual(summary['status'], 'ok')
+        self.assertEqual(summary['bytesRead'], bytesRead)
+
+        # The journal skips the second run: Nothing is read.
+        summary = yw_timeline_.sync_file(TEST_YW7)
+        self.assertEqual(summary['status'], 'ok')
+        self.assertEqual(summary['bytesRead'], 0)
+        self.assertEqual(summary['bytesWritten'], 0)
+
+    # @unittest.skip('')
+    def test_profile(self):
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        copyfile(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+        os.chdir(TEST_EXEC_PATH)
+        recorder = PhaseRecorder()
+        yw_timeline_.run(TEST_YW7, silentMode=True, recorder=recorder)
+        self.assertEqual(read_file(TEST_TL), read_file(TEST_DATA_PATH + 'modified.timeline'))
+        phases = {(record['filePath'], tuple(record['phase'])): record for record in recorder.records}
+        self.assertIn((TEST_YW7, ('read', 'read scenes')), phases)
+        self.assertIn((TEST_TL, ('write', 'indent')), phases)
+        self.assertEqual(phases[(TEST_TL, ('write', 'build events'))]['calls'], 1)
+        self.assertIsNotNone(phases[(TEST_TL, ('write',))]['peakBytes'])
+
+    # @unittest.skip('')
+    def test_project_cache(self):
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        copyfile(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+        copyfile(TEST_DATA_PATH + 'projectCache.ini', TEST_EXEC_PATH + INI_FILE)
+        os.chdir(TEST_EXEC_PATH)
+
+        def get_phases(sourcePath):
+            recorder = PhaseRecorder(traceMemory=False)
+            yw_timeline_.run(sourcePath, silentMode=True, recorder=recorder)
+            return [(record['filePath'], tuple(record['phase'])) for record in recorder.records]
+
+        # The yWriter project is parsed and cached.
+        phases = get_phases(TEST_YW7)
+        self.assertIn((TEST_YW7, ('read', 'write cache')), phases)
+        self.assertEqual(read_file(TEST_TL), read_file(TEST_DATA_PATH + 'modified.timeline'))
+
+        # The yWriter project is unchanged: It is taken from the cache.
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        phases = get_phases(TEST_YW7)
+        self.assertIn((TEST_YW7, ('read', 'read cache')), phases)
+        self.assertNotIn((TEST_YW7, ('read', 'write cache')), phases)
+        self.assertNotIn((TEST_YW7, ('read', 'read scenes')), phases)
+        self.assertEqual(read_file(TEST_TL), read_file(TEST_DATA_PATH + 'modified.timeline'))
+
+        # Both files are unchanged at the second run: They are taken from the cache,
+        # and the yWriter project is parsed just before writing.
+        copyfile(TEST_DATA_PATH + 'modified2.timeline', TEST_TL)
+        for __ in range(2):
+            copy2(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+            phases = get_phases(TEST_TL)
+            self.assertEqual(read_file(TEST_YW7), read_file(TEST_DATA_PATH + 'modified2.yw7'))
+        self.assertNotIn((TEST_TL, ('read', 'write cache')), phases)
+        self.assertNotIn((TEST_YW7, ('read', 'write cache')), phases)
+        self.assertIn((TEST_YW7, ('write', 'parse XML')), phases)
+
+    # @unittest.skip('')
+    def test_read_timeline_once(self):
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        copyfile(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+        os.chdir(TEST_EXEC_PATH)
+
+        # The existing timeline is parsed for merging, but not rewritten before writing.
+        recorder = PhaseRecorder(traceMemory=False)
+        yw_timeline_.run(TEST_YW7, silentMode=True, recorder=recorder)
+        phases = [tuple(record['phase']) for record in recorder.records if record['filePath'] == TEST_TL]
+        self.assertIn(('write', 'read existing file', 'parse XML'), phases)
+        self.assertNotIn(('write', 'read existing file', 'rewrite file'), phases)
+        self.assertEqual(read_file(TEST_TL), read_file(TEST_DATA_PATH + 'modified.timeline'))
+        self.assertEqual(read_file(TEST_TL_BAK), read_file(TEST_DATA_PATH + 'normal.timeline'))
+
+        # The XML tree read or written last is reused, as long as the file is unchanged.
+        kwargs = yw_timeline_.get_configuration(TEST_TL)
+        tlFile = TlFile(TEST_TL, **kwargs)
+        tlFile.novel = Novel()
+        tlFile.read()
+        newTlFile = TlFile(TEST_TL, **kwargs)
+        newTlFile.novel = tlFile.novel
+        newTlFile.write()
+        expected = read_file(TEST_TL)
+
+        copyfile(TEST_DATA_PATH + 'modified.timeline', TEST_TL)
+        tlFile = TlFile(TEST_TL, **kwargs)
+        tlFile.novel = Novel()
+        recorder = PhaseRecorder(traceMemory=False)
+        recorder.start()
+        with phase('read', TEST_TL):
+            tlFile.read()
+        for __ in range(2):
+            with phase('write', TEST_TL):
+                tlFile.write()
+        recorder.stop()
+        phases = [tuple(record['phase']) for record in recorder.records]
+        self.assertIn(('read', 'parse XML'), phases)
+        self.assertNotIn(('write', 'read existing file', 'parse XML'), phases)
+        self.assertEqual(read_file(TEST_TL), expected)
+
+        # The file is changed: It is parsed again.
+        copyfile(TEST_DATA_PATH + 'modified.timeline', TEST_TL)
+        recorder = PhaseRecorder(traceMemory=False)
+        recorder.start()
+        with phase('write', TEST_TL):
+            tlFile.write()
+        recorder.stop()
+        phases = [tuple(record['phase']) for record in recorder.records]
+        self.assertIn(('write', 'read existing file', 'parse XML'), phases)
+        self.assertEqual(read_file(TEST_TL), expected)
+
+    # @unittest.skip('')
+    def test_numbered_backups(self):
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        copyfile(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+        copyfile(TEST_DATA_PATH + 'numberedBackups.ini', TEST_EXEC_PATH + INI_FILE)
+        os.chdir(TEST_EXEC_PATH)
+        for __ in range(3):
+            yw_timeline_.run(TEST_YW7, silentMode=True)
+            yw_timeline_.run(TEST_TL, silentMode=True)
+        BackupRotation.wait()
+        self.assertEqual(read_file(TEST_TL), read_file(TEST_DATA_PATH + 'modified.timeline'))
+        self.assertFalse(os.path.isfile(TEST_TL_BAK))
+        self.assertFalse(os.path.isfile(TEST_YW_BAK))
+        for filePath in (TEST_TL, TEST_YW7):
+            self.assertFalse(os.path.isfile(f'{filePath}.bk0001'))
+            self.assertFalse(os.path.isfile(f'{filePath}.bk0001.gz'))
+            self.assertTrue(os.path.isfile(f'{filePath}.bk0002.gz'))
+            self.assertTrue(os.path.isfile(f'{filePath}.bk0003'))
+        self.assertEqual(read_file(f'{TEST_TL}.bk0003'), read_file(TEST_DATA_PATH + 'modified.timeline'))
+
+    # @unittest.skip('')
+    def test_no_indent(self):
+        copyfile(TEST_DATA_PATH + 'modified.yw7', TEST_YW7)
+        copyfile(TEST_DATA_PATH + 'noIndent.ini', TEST_EXEC_PATH + INI_FILE)
+        os.chdir(TEST_EXEC_PATH)
+
+        # A new timeline is not indented.
+        yw_timeline_.run(TEST_YW7, silentMode=True)
+        self.assertNotIn('\n  <', read_file(TEST_TL))
+        self.assertEqual(read_indented_xml(TEST_TL), read_indented_xml(TEST_DATA_PATH + 'new.timeline'))
+
+        # When updating a timeline, only the new events are indented.
+        copyfile(TEST_DATA_PATH + 'normal.timeline', TEST_TL)
+        yw_timeline_.run(TEST_YW7, silentMode=True)
+        self.assertEqual(read_indented_xml(TEST_TL), read_indented_xml(TEST_DATA_PATH + 'modified.timeline'))
+        self.assertIn('\n    <event>', read_file(TEST_TL))
+
     # @unittest.skip('')
     def test_modified2_tl_to_yw(self):
         copyfile(TEST_DATA_PATH + 'modified2.timeline', TEST_TL)